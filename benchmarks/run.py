@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import platform
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import REPORT_FILES, scale_rows, write_reports
+from src.config.settings import VERSION
+from src.utils.aggregation_utils import PERIODS, build_period_index, build_rollup, summarize_compliance, summarize_rollup
+from src.utils.cleaning_utils import (
+    CLEANING_VERSION,
+    clean_open_dock_no_shows,
+    clean_open_order,
+    clean_trailer_activity,
+    merge_compliance,
+)
+from src.utils.file_handler import read_report
+
+# A stage counts as a regression when it is this much slower than the baseline
+DEFAULT_TOLERANCE = 0.2
+
+def run_benchmarks(paths, repeat=3):
+    """
+    Time every pipeline stage on the report CSVs in paths (report type -> path): reading,
+    each cleaner, the merge, the rollup and every dashboard aggregation.
+    Returns a dict of stage -> {"seconds": best of repeat runs, "rows": output rows}.
+    """
+    results = {}
+
+    def stage(name, func, *args):
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = func(*args)
+            seconds.append(time.perf_counter() - start)
+        results[name] = {"seconds": round(min(seconds), 6), "rows": _row_count(output)}
+        return output
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        raw = {name: stage(f"read {name}", read_report, path, name) for name, path in paths.items()}
+        no_show_data = stage("clean_open_dock_no_shows", clean_open_dock_no_shows, raw["open_dock"])
+        cleaned_oo = stage("clean_open_order", clean_open_order, raw["open_order"])
+        cleaned_ta = stage("clean_trailer_activity", clean_trailer_activity, raw["trailer_activity"])
+        merged_df = stage("merge_compliance", merge_compliance, cleaned_oo, cleaned_ta)
+        rollup = stage("build_rollup", build_rollup, merged_df, no_show_data)
+        rollup["period_index"] = stage("build_period_index", build_period_index, rollup)
+
+        # Each dashboard: the busiest period of the data, or every year for YTD
+        for period in PERIODS:
+            selected = None
+            if period != "Year":
+                selected = rollup["compliance_rollup"].groupby(period)["Shipments"].sum().idxmax()
+            stage(f"summarize_rollup {period}", _summarize, summarize_rollup, rollup, period, selected)
+            stage(f"summarize_compliance {period}", _summarize, summarize_compliance, merged_df, no_show_data, period, selected)
+    return results
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Stages slower than the baseline by more than tolerance (a fraction), as (stage, baseline, current) seconds.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result["seconds"] > before["seconds"] * (1 + tolerance):
+            regressions.append((name, before["seconds"], result["seconds"]))
+    return regressions
+
+def _row_count(output):
+    # Rows of a frame, or of all frames in a dict of them (a rollup or a set of summaries)
+    if isinstance(output, dict):
+        return sum(len(value) for value in output.values() if isinstance(value, pd.DataFrame))
+    return len(output)
+
+def _summarize(summarize, *args):
+    summaries = summarize(*args)
+    return summaries or {}
+
+def main(argv=None):
+    """
+    Benchmark the pipeline on synthetic reports and write the timings to JSON. With --baseline,
+    stages that got slower than an earlier results file are listed and the exit code is 1.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=main.__doc__)
+    parser.add_argument("scale", help="one of 10k, 100k, 1m, 10m or a row count")
+    parser.add_argument("--data-dir", help="report CSVs, generated when missing (default: benchmarks/data/<scale>)")
+    parser.add_argument("-o", "--output", help="results file (default: benchmarks/results/<scale>.json)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the fastest is kept (default: 3)")
+    parser.add_argument("--baseline", help="earlier results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown against the baseline, as a fraction (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    rows = scale_rows(args.scale)
+    data_dir = args.data_dir or os.path.join("benchmarks", "data", args.scale)
+    paths = {name: os.path.join(data_dir, file_name) for name, file_name in REPORT_FILES.items()}
+    if not all(os.path.isfile(path) for path in paths.values()):
+        paths = write_reports(data_dir, rows)
+
+    report = {
+        "app_version": VERSION,
+        "cleaning_version": CLEANING_VERSION,
+        "scale": args.scale,
+        "rows": rows,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+        "results": run_benchmarks(paths, repeat=args.repeat),
+    }
+    output = args.output or os.path.join("benchmarks", "results", f"{args.scale}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    width = max(len(name) for name in report["results"])
+    for name, result in report["results"].items():
+        print(f"{name:<{width}}  {result['seconds']:>9.3f}  {result['rows']:>10,}")
+    print(f"results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(report["results"], baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.3f} s -> {after:.3f} s")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
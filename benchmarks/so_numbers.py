@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.cleaning_utils import combine_open_order_rows
+
+def make_open_order_rows(n_rows, n_shipments, seed=0):
+    """
+    Synthetic cleaned Open Order rows: several SO Numbers per shipment, with repeats.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Shipment Nbr': rng.integers(10_000_000, 10_000_000 + n_shipments, n_rows).astype(str).astype(object),
+        'Appt Date and Time': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, n_rows), unit='s'),
+        'SO #': np.char.add('SO', rng.integers(0, n_rows, n_rows).astype(str)).astype(object),
+    })
+
+def combine_with_lambda(oo_df):
+    """
+    The per-group implementation replaced by combine_open_order_rows.
+    """
+    oo_df = oo_df.groupby('Shipment Nbr', as_index=False).agg({
+        'Appt Date and Time': 'first',
+        'SO #': lambda x: ', '.join(sorted(set(x))),
+    })
+    return oo_df.rename(columns={'Shipment Nbr': 'Shipment ID', 'Appt Date and Time': 'Appt DateTime', 'SO #': 'SO Number'})
+
+def main(argv=None):
+    """
+    Time combine_open_order_rows against the per-group lambda and check both give the same rows.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.so_numbers", description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=600_000, help="Open Order rows (default: 600000)")
+    parser.add_argument("--shipments", type=int, default=200_000, help="distinct shipments (default: 200000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per implementation, best is kept (default: 3)")
+    args = parser.parse_args(argv)
+
+    oo_rows = make_open_order_rows(args.rows, args.shipments)
+    results = {}
+    for name, combine in [("lambda", combine_with_lambda), ("vectorized", combine_open_order_rows)]:
+        seconds = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = combine(oo_rows)
+            seconds.append(time.perf_counter() - start)
+        print(f"{name:<12} {min(seconds):>8.3f} s")
+    pd.testing.assert_frame_equal(results["vectorized"], results["lambda"])
+    print(f"identical output for {len(results['lambda']):,} shipments")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from src.utils.cleaning_utils import CARRIERS_TO_EXCLUDE
+
+# Named sizes, in rows per report
+SCALES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+REPORT_FILES = {
+    "open_dock": "open_dock.csv",
+    "open_order": "open_order.csv",
+    "trailer_activity": "trailer_activity.csv",
+}
+DATETIME_FORMAT = "%m/%d/%Y %H:%M"
+CHUNK_ROWS = 250_000
+
+# Tracked carriers plus a few excluded ones, as in the real exports
+CARRIERS = ["ABCD", "WXYZ", "RLCA", "JBHT", "SCNN", "KNXT", *CARRIERS_TO_EXCLUDE[:4]]
+
+def write_reports(output_dir, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """
+    Write Open Dock, Open Order and Trailer Activity CSVs of `rows` rows each to output_dir,
+    with the headers, timestamp format and messy values of the real exports. Rows are
+    generated and written chunk by chunk, so 10M-row files do not have to fit in memory.
+    Returns a dict of report type -> CSV path.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, file_name) for name, file_name in REPORT_FILES.items()}
+    writers = {}
+    rng = np.random.default_rng(seed)
+    try:
+        for start in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - start)
+            ta_df = make_trailer_activity(rng, n, first_id=10_000_000 + 2 * start)
+            chunks = {
+                "open_dock": make_open_dock(rng, n),
+                "open_order": make_open_order(rng, ta_df, n),
+                "trailer_activity": ta_df,
+            }
+            for name, df in chunks.items():
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if name not in writers:
+                    writers[name] = pa_csv.CSVWriter(paths[name], table.schema)
+                writers[name].write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
+
+def make_trailer_activity(rng, n, first_id=10_000_000):
+    """
+    Trailer Activity rows: one visit per shipment, most of them closed loads.
+    """
+    appointment = _random_times(rng, n)
+    checkin = appointment + pd.to_timedelta(rng.normal(30, 240, n).clip(-600, 3000).astype(int), unit="min")
+    loaded = checkin + pd.to_timedelta(rng.gamma(2.0, 70, n).astype(int) + 10, unit="min")
+    checkout = loaded + pd.to_timedelta(rng.integers(5, 90, n), unit="min")
+    shipment_ids = first_id + rng.permutation(2 * n)[:n]
+    return pd.DataFrame({
+        " CHECKIN DATE TIME": _format(checkin),
+        "APPOINTMENT DATE TIME": _format(appointment),
+        "CHECKOUT DATE TIME": _format(checkout),
+        "CARRIER": rng.choice(CARRIERS, n),
+        "VISIT TYPE": rng.choice(["Live Load", "Pickup Load", "Drop Empty", "Live Unload"], n, p=[0.45, 0.35, 0.1, 0.1]),
+        "ACTIVITY TYPE": rng.choice(["CLOSED", "OPEN"], n, p=[0.9, 0.1]),
+        "SHIPMENT_ID": _thousands(shipment_ids),
+        "Date/Time": _format(loaded),
+    })
+
+def make_open_order(rng, ta_df, n):
+    """
+    Open Order lines: mostly for shipments in ta_df, one to three SO Numbers per shipment,
+    some never seen at the dock and a few unparseable appointments.
+    """
+    known_ids = ta_df["SHIPMENT_ID"].str.replace(",", "").to_numpy().astype(np.int64)
+    picks = rng.integers(0, len(known_ids), n)
+    shipment_ids = np.where(rng.random(n) < 0.9, known_ids[picks], rng.integers(90_000_000, 99_999_999, n))
+    appointment = ta_df["APPOINTMENT DATE TIME"].to_numpy()[picks].astype(object)
+    appointment[rng.random(n) < 0.01] = "TBD"
+    return pd.DataFrame({
+        "Appt Date and Time ": appointment,
+        "SO #": np.char.add(" SO", rng.integers(1_000_000, 9_999_999, n).astype(str)).astype(object),
+        "Shipment Nbr": np.char.add("SHP-", _thousands(shipment_ids).astype(str)).astype(object),
+        "Order Status": rng.choice(["Shipped", " shipped ", "Open", "Cancelled"], n, p=[0.7, 0.1, 0.1, 0.1]),
+    })
+
+def make_open_dock(rng, n):
+    """
+    Open Dock appointments in both directions, with completed, no-show and cancelled ones.
+    """
+    return pd.DataFrame({
+        "Appt Date": _format(_random_times(rng, n)),
+        "Direction ": rng.choice(["Outbound", "OUTBOUND", "Inbound"], n, p=[0.5, 0.2, 0.3]),
+        "Status": rng.choice(["Completed", "NoShow", "Cancelled"], n, p=[0.8, 0.1, 0.1]),
+        "Carrier": rng.choice(CARRIERS, n),
+    })
+
+def _random_times(rng, n):
+    # Appointments on the quarter hour over one year
+    return pd.Timestamp("2024-01-01") + pd.to_timedelta(15 * rng.integers(0, 4 * 24 * 366, n), unit="min")
+
+def _format(times):
+    return pd.DatetimeIndex(times).strftime(DATETIME_FORMAT).to_numpy(dtype=object)
+
+def _thousands(values):
+    # Shipment numbers are exported with thousands separators
+    return pd.Series(values).map("{:,}".format).to_numpy(dtype=object)
+
+def main(argv=None):
+    """
+    Write synthetic report CSVs at a named scale or row count.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic_data", description=main.__doc__)
+    parser.add_argument("scale", help=f"one of {list(SCALES)} or a row count")
+    parser.add_argument("-o", "--output-dir", help="directory for the CSVs (default: benchmarks/data/<scale>)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    rows = scale_rows(args.scale)
+    output_dir = args.output_dir or os.path.join("benchmarks", "data", args.scale)
+    for name, path in write_reports(output_dir, rows, seed=args.seed).items():
+        print(f"{name:<17} {path}")
+    return 0
+
+def scale_rows(scale):
+    """
+    Row count for a named scale ("10k", "1m", ...) or a plain number.
+    """
+    if scale.lower() in SCALES:
+        return SCALES[scale.lower()]
+    if scale.isdigit():
+        return int(scale)
+    raise ValueError(f"Unknown scale '{scale}'. Expected one of {list(SCALES)} or a row count.")
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,7 +8,7 @@ sys.path.append(root_dir)
 
 import streamlit as st
 from src.app.tabs.tab_upload import render as render_upload
-from src.app.tabs.tab_cleaned_data import render as render_cleaned_data
+from src.app.tabs.tab_cleaned_data import render as render_cleaned_data, build_cleaned_data
 from src.app.tabs.tab_daily import render as render_daily
 from src.app.tabs.tab_weekly import render as render_weekly
 from src.app.tabs.tab_monthly import render as render_monthly
@@ -22,24 +22,26 @@ st.set_page_config(page_title=APP_TITLE, layout="wide")
 st.title(APP_TITLE)
 st.write(f"Version: {VERSION}")
 
-# Tabs
-tabs = st.tabs(["Data Upload", "Cleaned Data", "Daily Dashboard", "Weekly Dashboard", "Monthly Dashboard", "YTD Dashboard"])
-
-# Render Tabs
-with tabs[0]:
-    render_upload()
-
-with tabs[1]:
-    render_cleaned_data()
-
-with tabs[2]:
-    render_daily()
-
-with tabs[3]:
-    render_weekly()
-
-with tabs[4]:
-    render_monthly()
-
-with tabs[5]:
-    render_ytd()
\ No newline at end of file
+# Pages
+pages = {
+    "Data Upload": render_upload,
+    "Cleaned Data": render_cleaned_data,
+    "Daily Dashboard": render_daily,
+    "Weekly Dashboard": render_weekly,
+    "Monthly Dashboard": render_monthly,
+    "YTD Dashboard": render_ytd,
+}
+dashboard_pages = ["Daily Dashboard", "Weekly Dashboard", "Monthly Dashboard", "YTD Dashboard"]
+
+# Only the selected page runs, so switching dashboards does not recompute the others
+selected_page = st.sidebar.radio("Navigation", list(pages), key="selected_page")
+
+# Dashboards need the cleaned datasets even if the Cleaned Data page was never opened
+if selected_page in dashboard_pages:
+    try:
+        build_cleaned_data()
+    except Exception as e:
+        st.error(f"An error occurred during data processing: {e}")
+
+# Render Page
+pages[selected_page]()
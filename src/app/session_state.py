@@ -0,0 +1,115 @@
+import streamlit as st
+
+from src.config.settings import UPLOAD_SPILL_PATH
+from src.utils.cache_utils import UPLOAD_NAMES
+from src.utils.memory_utils import freeze_frame, frame_view
+from src.utils.spill_utils import SpilledFrame, load_frame, preview_frame, spill_frame
+
+CLEANED_DATASET_KEYS = ["no_show_data", "dwell_and_ontime_compliance", "compliance_rollup", "no_show_rollup"]
+# Row-level datasets are held once per session as immutable Arrow tables; pages read views of them
+FROZEN_DATASET_KEYS = ["no_show_data", "dwell_and_ontime_compliance"]
+
+def init_upload_state():
+    """
+    Create the per-session upload slots on first run.
+    """
+    for key in ["uploaded_files", "uploaded_file_hashes", "uploaded_file_ids"]:
+        if key not in st.session_state:
+            st.session_state[key] = {name: None for name in UPLOAD_NAMES}
+
+def is_new_upload(name, upload):
+    """
+    True when the uploader holds a file this session has not parsed yet.
+    Streamlit returns the same upload on every rerun, so it is compared by file id.
+    """
+    file_id = getattr(upload, "file_id", None)
+    return file_id is None or st.session_state.uploaded_file_ids[name] != file_id
+
+def store_upload(name, upload, df, file_hash):
+    """
+    Save a parsed upload and drop cleaned data built from a different file.
+    """
+    st.session_state.uploaded_file_ids[name] = getattr(upload, "file_id", None)
+    if st.session_state.uploaded_file_hashes[name] != file_hash:
+        invalidate_cleaned_data()
+    st.session_state.uploaded_files[name] = df
+    st.session_state.uploaded_file_hashes[name] = file_hash
+
+def get_uploads():
+    """
+    The parsed uploads as DataFrames, reading back any that release_uploads wrote to disk.
+    """
+    return {name: load_frame(frame) for name, frame in st.session_state.uploaded_files.items()}
+
+def get_upload_preview(name, rows=5):
+    """
+    First rows of a parsed upload, without reading a released one back in full.
+    """
+    return preview_frame(st.session_state.uploaded_files[name], rows)
+
+def release_uploads(spill_dir=UPLOAD_SPILL_PATH):
+    """
+    Write the parsed uploads to temporary Parquet files and drop them from memory; get_uploads
+    reads them back if they have to be cleaned again.
+    """
+    uploaded_files = st.session_state.uploaded_files
+    for name, frame in uploaded_files.items():
+        if frame is not None and not isinstance(frame, SpilledFrame):
+            uploaded_files[name] = spill_frame(frame, spill_dir)
+
+def get_cleaned_data(fingerprint):
+    """
+    Cleaned datasets from this session if they were built from the given upload fingerprint.
+    """
+    if st.session_state.get("cleaned_fingerprint") != fingerprint:
+        return None
+    if not all(key in st.session_state for key in CLEANED_DATASET_KEYS):
+        return None
+    return {key: get_dataset(key) for key in CLEANED_DATASET_KEYS}
+
+def get_dataset(key):
+    """
+    One cleaned dataset from session state, None if missing. Row-level datasets come back as
+    read-only views of the shared Arrow table, so derived columns have to go into a new frame.
+    """
+    dataset = st.session_state.get(key)
+    if key in FROZEN_DATASET_KEYS and dataset is not None:
+        return frame_view(dataset)
+    return dataset
+
+def set_cleaned_data(fingerprint, datasets):
+    """
+    Save cleaned datasets (dict keyed by CLEANED_DATASET_KEYS) built from the given upload fingerprint.
+    Row-level datasets are frozen to Arrow tables, so the frames passed in can be released.
+    """
+    for key in CLEANED_DATASET_KEYS:
+        dataset = datasets[key]
+        st.session_state[key] = freeze_frame(dataset) if key in FROZEN_DATASET_KEYS else dataset
+    st.session_state['cleaned_fingerprint'] = fingerprint
+
+def invalidate_cleaned_data():
+    """
+    Forget cleaned datasets so the next Cleaned Data run rebuilds them.
+    """
+    for key in CLEANED_DATASET_KEYS + ["cleaned_fingerprint", "prepared_exports"]:
+        st.session_state.pop(key, None)
+
+def get_export(name):
+    """
+    Prepared download bytes for name, if they were built from the current cleaned data.
+    """
+    fingerprint = st.session_state.get("cleaned_fingerprint")
+    return st.session_state.get("prepared_exports", {}).get((name, fingerprint))
+
+def set_export(name, data):
+    """
+    Save prepared download bytes for name, keyed by the current cleaned data fingerprint.
+    Exports built from older data are dropped.
+    """
+    fingerprint = st.session_state.get("cleaned_fingerprint")
+    exports = {
+        key: value for key, value in st.session_state.get("prepared_exports", {}).items()
+        if key[1] == fingerprint
+    }
+    exports[(name, fingerprint)] = data
+    st.session_state["prepared_exports"] = exports
@@ -0,0 +1,193 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from io import BytesIO
+from src.app.session_state import get_dataset, get_export, set_export
+from src.utils.aggregation_utils import build_period_index, build_rollup
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+def get_dashboard_data():
+    """
+    Return the rollup built from the cleaned datasets in session state (see
+    aggregation_utils.build_rollup) with its period index, or None after showing what is missing.
+    """
+    if 'dwell_and_ontime_compliance' not in st.session_state:
+        st.error("Dwell and On-Time Compliance data is missing. Please upload the datasets first.")
+        return None
+
+    if 'no_show_data' not in st.session_state or st.session_state['no_show_data'] is None:
+        st.error("No Show data is missing. Please upload the Open Dock dataset.")
+        return None
+
+    if 'compliance_rollup' not in st.session_state or 'no_show_rollup' not in st.session_state:
+        st.session_state.update(build_rollup(get_dataset('dwell_and_ontime_compliance'), get_dataset('no_show_data')))
+    rollup = {
+        'compliance_rollup': st.session_state['compliance_rollup'],
+        'no_show_rollup': st.session_state['no_show_rollup'],
+    }
+
+    # Built once per rollup; a new rollup object means the cleaned data changed
+    cached = st.session_state.get('rollup_period_index')
+    if cached is None or cached[0] is not rollup['compliance_rollup']:
+        cached = (rollup['compliance_rollup'], build_period_index(rollup))
+        st.session_state['rollup_period_index'] = cached
+    rollup['period_index'] = cached[1]
+    return rollup
+
+def render_dashboard(summaries, labels):
+    """
+    Render the pivot tables, charts and Excel download for one dashboard.
+    summaries comes from aggregation_utils.summarize_rollup; labels holds the tab's titles.
+    """
+    compliance_pivot = summaries['period']
+    carrier_pivot = summaries['carrier']
+    dwell_pivot = summaries['dwell']
+    dwell_average_pivot = summaries['dwell_average']
+
+    # Display Pivot Table
+    st.subheader(labels['period_title'])
+    st.table(compliance_pivot)
+
+    # Display Pivot Table for On Time Compliance by Carrier
+    st.subheader(labels['carrier_title'])
+    st.table(carrier_pivot)
+
+    # Heatmap in an Expander
+    with st.expander(labels['heatmap_expander']):
+        heatmap_data = carrier_pivot.set_index('Carrier')[['On Time %']]
+        fig = go.Figure(data=go.Heatmap(
+            z=heatmap_data['On Time %'].values.reshape(-1, 1),
+            x=['On Time %'],
+            y=heatmap_data.index,
+            colorscale='RdYlGn',
+            colorbar=dict(title="On Time %"),
+            text=heatmap_data['On Time %'].values.reshape(-1, 1),
+            texttemplate="%{text:.2f}%",
+            showscale=True
+        ))
+        fig.update_layout(
+            title=labels['heatmap_title'],
+            xaxis_title='',
+            yaxis_title='Carrier',
+            yaxis_autorange='reversed',
+            height=len(heatmap_data) * 40 + 100
+        )
+        st.plotly_chart(fig, use_container_width=True, key=labels.get('heatmap_key'))
+
+    # Display Pivot Table for Dwell Time Categories
+    st.subheader(labels['dwell_title'])
+    st.table(dwell_pivot)
+
+    # Add Stacked Bar Chart in Expander
+    with st.expander(labels['dwell_chart_expander']):
+        categories = dwell_pivot['Dwell Time Category']
+        late_percentages = dwell_pivot['Late % of Total'].fillna(0)
+        on_time_percentages = dwell_pivot['On Time % of Total'].fillna(0)
+
+        # Create Stacked Bar Chart
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=categories,
+            y=on_time_percentages,
+            name='On Time',
+            marker_color='green',
+            text=on_time_percentages,
+            textposition='inside'
+        ))
+        fig.add_trace(go.Bar(
+            x=categories,
+            y=late_percentages,
+            name='Late',
+            marker_color='red',
+            text=late_percentages,
+            textposition='inside'
+        ))
+
+        # Layout adjustments
+        fig.update_layout(
+            barmode='stack',
+            title=labels['dwell_chart_title'],
+            xaxis_title='Dwell Time Category',
+            yaxis_title='% of Total Shipments',
+            legend_title='Compliance',
+            xaxis_tickangle=-45
+        )
+
+        # Display the chart
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Display Pivot Table for Average Dwell Time by Visit Type
+    st.subheader(labels['average_title'])
+    st.table(dwell_average_pivot)
+
+    # Grouped Bar Chart in Expander
+    with st.expander(labels['average_chart_expander']):
+        fig = go.Figure()
+
+        # Add bars for Late and On Time
+        fig.add_trace(go.Bar(
+            x=dwell_average_pivot['Visit Type'],
+            y=dwell_average_pivot['Late'],
+            name='Late',
+            marker_color='red',
+            text=dwell_average_pivot['Late'],
+            textposition='auto',
+            texttemplate='%{text:.2f}'
+        ))
+        fig.add_trace(go.Bar(
+            x=dwell_average_pivot['Visit Type'],
+            y=dwell_average_pivot['On Time'],
+            name='On Time',
+            marker_color='green',
+            text=dwell_average_pivot['On Time'],
+            textposition='auto',
+            texttemplate='%{text:.2f}'
+        ))
+
+        # Layout adjustments
+        fig.update_layout(
+            barmode='group',
+            title=labels['average_chart_title'],
+            xaxis_title='Visit Type',
+            yaxis_title='Average Dwell Time (hours)',
+            legend_title='Compliance',
+            xaxis_tickangle=-45
+        )
+
+        # Display the chart
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Download Button, the workbook is only written once requested
+    lazy_download_button(
+        label=labels['download_label'],
+        build=lambda: to_excel(summaries, labels['sheets']),
+        file_name=labels['file_name'],
+        mime=EXCEL_MIME,
+    )
+
+def lazy_download_button(label, build, file_name, mime):
+    """
+    Download button whose data is only built after a "Prepare export" click.
+    The bytes are kept per file name (tab and period) and cleaned data fingerprint,
+    so later reruns serve them without rebuilding.
+    """
+    data = get_export(file_name)
+    if data is None:
+        if not st.button(f"Prepare export: {file_name}", key=f"prepare_{file_name}"):
+            return
+        with st.spinner(f"Preparing {file_name}..."):
+            data = build()
+        set_export(file_name, data)
+
+    st.download_button(label=label, data=data, file_name=file_name, mime=mime)
+
+def to_excel(summaries, sheets):
+    """
+    Write the summaries to an Excel workbook, one sheet per entry in sheets (summary name -> sheet name).
+    """
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        for name, sheet_name in sheets.items():
+            summaries[name].to_excel(writer, sheet_name=sheet_name, index=False)
+    return output.getvalue()
@@ -1,47 +1,178 @@
+import duckdb
+import pandas as pd
 import streamlit as st
-from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows
+from src.app.session_state import (
+    CLEANED_DATASET_KEYS,
+    get_cleaned_data,
+    get_dataset,
+    get_uploads,
+    release_uploads,
+    set_cleaned_data,
+)
+from src.app.tabs.dashboard_view import lazy_download_button
+from src.utils.aggregation_utils import build_rollup
+from src.config.settings import LEAN_UPLOADS, PROFILE_MEMORY, WAREHOUSE_PATH
+from src.utils.cache_utils import dataset_cache_key, load_cleaned_datasets, save_cleaned_datasets
+from src.utils.cleaning_utils import clean_open_dock_no_shows, compact_compliance
+from src.utils.parallel_pipeline import clean_reports
+from src.utils.profiling import log_profile, profiling
+from src.utils.shipment_store import ingest_reports, load_compliance, load_no_shows
+from src.utils.warehouse import load_datasets, save_datasets
+
+def build_cleaned_data():
+    """
+    Return (no_show_data, merged_df) for the current uploads, or None until all three files are uploaded.
+    Reuses this session's datasets, then the warehouse or disk cache, before cleaning again. In incremental mode
+    the uploads are added to the shipment store and merged_df is read from it. With LEAN_UPLOADS, the raw
+    uploads are released to disk once the cleaned datasets are in place.
+    """
+    uploaded_files = st.session_state.get("uploaded_files", {})
+    if not uploaded_files or not all(file is not None for file in uploaded_files.values()):
+        return None
+
+    incremental = st.session_state.get("incremental_mode", False)
+    file_hashes = st.session_state.get("uploaded_file_hashes", {})
+    cache_key = dataset_cache_key(file_hashes) if all(file_hashes.get(name) for name in uploaded_files) else None
+    if incremental and cache_key:
+        cache_key = f"store-{cache_key}"
+    # Datasets of this session are shared read-only views, never frozen again
+    session_datasets = get_cleaned_data(cache_key) if cache_key else None
+    if session_datasets is not None:
+        return session_datasets['no_show_data'], session_datasets['dwell_and_ontime_compliance']
+
+    cached = _load_saved_datasets(cache_key) if cache_key and not incremental else None
+    if cached is not None:
+        datasets = cached
+    else:
+        # Released uploads are only read back here, when they have to be cleaned again
+        uploads = get_uploads()
+        with profiling(memory=PROFILE_MEMORY) as profile:
+            if incremental:
+                no_show_data, merged_df = _ingest_uploads(uploads, file_hashes)
+            else:
+                no_show_data, merged_df = clean_reports(
+                    uploads["open_dock"], uploads["open_order"], uploads["trailer_activity"]
+                )
+        _record_profile(profile, cache_key, incremental)
+        datasets = {
+            'no_show_data': no_show_data,
+            'dwell_and_ontime_compliance': merged_df,
+            **build_rollup(merged_df, no_show_data),
+        }
+        # The store changes with every ingest, so only full rebuilds go to the disk cache
+        if cache_key and not incremental:
+            try:
+                _save_datasets(cache_key, uploads, datasets)
+            except (OSError, duckdb.Error) as e:
+                st.warning(f"Could not write the cleaned data cache: {e}")
+
+    # Pages work on views of the frozen tables, so the frames built here can be freed
+    set_cleaned_data(cache_key, datasets)
+    if LEAN_UPLOADS:
+        release_uploads()
+    return get_dataset('no_show_data'), get_dataset('dwell_and_ontime_compliance')
+
+def _load_saved_datasets(cache_key):
+    # Datasets saved by an earlier run, from the warehouse when one is configured
+    if WAREHOUSE_PATH:
+        datasets = load_datasets(cache_key, CLEANED_DATASET_KEYS)
+        if datasets is not None:
+            # DuckDB returns ENUM columns as ordered categoricals
+            datasets['dwell_and_ontime_compliance'] = compact_compliance(datasets['dwell_and_ontime_compliance'])
+        return datasets
+    return load_cleaned_datasets(cache_key, CLEANED_DATASET_KEYS)
+
+def _save_datasets(cache_key, uploaded_files, datasets):
+    # The warehouse keeps the raw uploads next to the cleaned and merged tables
+    if WAREHOUSE_PATH:
+        raw = {f"raw_{name}": df for name, df in uploaded_files.items()}
+        save_datasets(cache_key, {**raw, **datasets})
+    else:
+        save_cleaned_datasets(cache_key, datasets)
+
+def _record_profile(profile, cache_key, incremental):
+    # Keep the stages of this cleaning run for the Pipeline profile panel and the JSON log
+    st.session_state["pipeline_profile"] = profile
+    try:
+        log_profile(profile, cache_key=cache_key, incremental=incremental)
+    except OSError as e:
+        st.warning(f"Could not write the pipeline profile log: {e}")
+
+def render_pipeline_profile():
+    """
+    Collapsible table of the stages that parsed this session's uploads and of its last cleaning run.
+    """
+    upload_profiles = st.session_state.get("upload_profiles", {})
+    profile = [record for records in upload_profiles.values() for record in records]
+    profile += st.session_state.get("pipeline_profile") or []
+    if not profile:
+        return
+    with st.expander("Pipeline profile"):
+        table = pd.DataFrame(profile)
+        table["stage"] = ["· " * depth + name for depth, name in zip(table["depth"], table["stage"])]
+        table = table.drop(columns="depth")
+        if "parse_failures" in table:
+            table["parse_failures"] = table["parse_failures"].astype("Int64")
+        if table["peak_memory_bytes"].isna().all():
+            table = table.drop(columns="peak_memory_bytes")
+            st.caption("Peak memory is measured when PROFILE_MEMORY is enabled in the settings.")
+        else:
+            table["peak_memory_bytes"] = (table["peak_memory_bytes"] / 1024 ** 2).round(1)
+            table = table.rename(columns={"peak_memory_bytes": "peak memory (MiB)"})
+            st.caption("Peak memory counts Python and NumPy allocations; Arrow and DuckDB memory is not included.")
+        st.dataframe(table, hide_index=True)
+
+def _ingest_uploads(uploaded_files, file_hashes):
+    # Upsert the Open Order / Trailer Activity delta into the shipment store, once per pair of files
+    delta_id = None
+    if file_hashes.get("open_order") and file_hashes.get("trailer_activity"):
+        delta_id = f"{file_hashes['open_order']}-{file_hashes['trailer_activity']}"
+    no_show_data = clean_open_dock_no_shows(uploaded_files["open_dock"])
+    ingest_reports(
+        uploaded_files["open_order"], uploaded_files["trailer_activity"], delta_id=delta_id,
+        no_show_data=no_show_data, no_show_id=file_hashes.get("open_dock") or None,
+    )
+    # No Shows cover every Open Dock upload in the store, like compliance covers every shipment
+    stored_no_shows = load_no_shows()
+    return no_show_data if stored_no_shows is None else stored_no_shows, load_compliance()
 
 def render():
     st.header("Cleaned Data")
     st.write("View and download the cleaned dataset.")
 
     uploaded_files = st.session_state.get("uploaded_files", {})
-    if not all(file is not None for file in uploaded_files.values()):
+    if not uploaded_files or not all(file is not None for file in uploaded_files.values()):
         st.warning("Please upload all three files in the Data Upload tab.")
         return
 
-    open_dock = uploaded_files["open_dock"]
-    open_order = uploaded_files["open_order"]
-    trailer_activity = uploaded_files["trailer_activity"]
-
     # Cleaned datasets
     st.subheader("Cleaned Datasets")
 
     try:
+        no_show_data, merged_df = build_cleaned_data()
+
+        render_pipeline_profile()
+
         # Process No Show Data
-        no_show_data = clean_open_dock_no_shows(open_dock)
-        st.session_state['no_show_data'] = no_show_data  # Save No Show Data to session state
         st.markdown("### No Show Data")
         st.dataframe(no_show_data)
 
         # Merged Dataset
-        merged_df = clean_and_merge_compliance(open_order, trailer_activity)
-        st.session_state['dwell_and_ontime_compliance'] = merged_df  # Save to session state
         st.markdown("### Dwell and On-Time Compliance Data")
         st.dataframe(merged_df)
 
         # Optional: Download button for No Show Data
-        st.download_button(
+        lazy_download_button(
             label="Download No Show Data as CSV",
-            data=no_show_data.to_csv(index=False).encode('utf-8'),
+            build=lambda: no_show_data.to_csv(index=False).encode('utf-8'),
             file_name="no_show_data.csv",
             mime="text/csv",
         )
 
         # Optional: Download button for Merged Data
-        st.download_button(
+        lazy_download_button(
             label="Download Merged Data as CSV",
-            data=merged_df.to_csv(index=False).encode('utf-8'),
+            build=lambda: merged_df.to_csv(index=False).encode('utf-8'),
             file_name="dwell_and_ontime_compliance.csv",
             mime="text/csv",
         )
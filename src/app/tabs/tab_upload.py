@@ -1,32 +1,86 @@
-import pandas as pd
+import warnings
+
 import streamlit as st
+from src.app.session_state import (
+    get_upload_preview,
+    init_upload_state,
+    invalidate_cleaned_data,
+    is_new_upload,
+    store_upload,
+)
+from src.config.settings import PROFILE_MEMORY
+from src.utils.datetime_utils import TimestampParseWarning
+from src.utils.file_handler import file_digest, read_report
+from src.utils.profiling import log_profile, profiling
 
 def render():
     st.header("Data Upload")
     st.write("Upload your Open Dock, Open Order, and Trailer Activity files below.")
 
     # Initialize session state
-    if "uploaded_files" not in st.session_state:
-        st.session_state.uploaded_files = {"open_dock": None, "open_order": None, "trailer_activity": None}
+    init_upload_state()
 
     # Open Dock
     open_dock = st.file_uploader("Upload Open Dock CSV", type=["csv"], key="open_dock")
     if open_dock is not None:
-        st.session_state.uploaded_files["open_dock"] = pd.read_csv(open_dock, low_memory=False)
+        _load_upload("open_dock", open_dock)
+        _show_parse_warnings("open_dock")
         st.subheader("Open Dock Preview")
-        st.dataframe(st.session_state.uploaded_files["open_dock"].head())
+        st.dataframe(get_upload_preview("open_dock"))
 
     # Open Order
     open_order = st.file_uploader("Upload Open Order CSV", type=["csv"], key="open_order")
     if open_order is not None:
-        st.session_state.uploaded_files["open_order"] = pd.read_csv(open_order, low_memory=False)
+        _load_upload("open_order", open_order)
+        _show_parse_warnings("open_order")
         st.subheader("Open Order Preview")
-        st.dataframe(st.session_state.uploaded_files["open_order"].head())
+        st.dataframe(get_upload_preview("open_order"))
 
     # Trailer Activity
     trailer_activity = st.file_uploader("Upload Trailer Activity CSV", type=["csv"], key="trailer_activity")
     if trailer_activity is not None:
-        st.session_state.uploaded_files["trailer_activity"] = pd.read_csv(trailer_activity, low_memory=False)
+        _load_upload("trailer_activity", trailer_activity)
+        _show_parse_warnings("trailer_activity")
         st.subheader("Trailer Activity Preview")
-        st.dataframe(st.session_state.uploaded_files["trailer_activity"].head())
+        st.dataframe(get_upload_preview("trailer_activity"))
+
+    # Incremental mode: new days are added to the shipment store instead of replacing the history
+    st.checkbox(
+        "Incremental mode: add these Open Order and Trailer Activity files to the shipment store",
+        value=st.session_state.get("incremental_mode", False),
+        key="incremental_mode_toggle",
+        on_change=_toggle_incremental_mode,
+        help="Only the shipments in the new files are cleaned and merged; the dashboards show the whole store.",
+    )
+
+def _load_upload(name, upload):
+    # Parse only files this session has not seen; reruns reuse the stored frame
+    if is_new_upload(name, upload):
+        with warnings.catch_warnings(record=True) as caught, profiling(memory=PROFILE_MEMORY) as profile:
+            warnings.simplefilter("always", TimestampParseWarning)
+            df = read_report(upload, name)
+        file_hash = file_digest(upload)
+        store_upload(name, upload, df, file_hash)
+        st.session_state.setdefault("upload_parse_warnings", {})[name] = [
+            str(warning.message) for warning in caught if issubclass(warning.category, TimestampParseWarning)
+        ]
+        _record_upload_profile(name, profile, file_hash)
+
+def _record_upload_profile(name, profile, file_hash):
+    # Parsing stages of each upload go to the Pipeline profile panel and the JSON log
+    st.session_state.setdefault("upload_profiles", {})[name] = profile
+    try:
+        log_profile(profile, report=name, file_hash=file_hash)
+    except OSError as e:
+        st.warning(f"Could not write the pipeline profile log: {e}")
+
+def _show_parse_warnings(name):
+    # Timestamps that did not match the column's format are kept as empty values
+    for message in st.session_state.get("upload_parse_warnings", {}).get(name, []):
+        st.warning(message)
+
 
+def _toggle_incremental_mode():
+    # Widget state is dropped while another page is shown, so the mode is kept under its own key
+    st.session_state["incremental_mode"] = st.session_state["incremental_mode_toggle"]
+    invalidate_cleaned_data()
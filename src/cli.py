@@ -0,0 +1,167 @@
+import argparse
+import os
+import sys
+
+import pyarrow as pa
+
+from src.utils.aggregation_utils import PERIODS, build_rollup, summarize_rollup
+from src.utils.cleaning_utils import (
+    clean_and_merge_compliance,
+    clean_open_dock_no_shows,
+    clean_open_order,
+    compact_compliance,
+    merge_compliance,
+    uncompact_compliance,
+)
+from src.utils.file_handler import file_digest, read_report
+from src.utils.memory_utils import format_memory_report, memory_report
+from src.utils.profiling import profile_stage, profiling
+from src.utils.shipment_store import ingest_reports, load_compliance, load_no_shows
+from src.utils.streaming_pipeline import clean_trailer_activity_to_parquet
+
+OUTPUT_FORMATS = ["parquet", "csv"]
+
+def main(argv=None):
+    """
+    Clean and merge the three report CSVs without Streamlit, write the cleaned datasets
+    and every period's pivots to an output directory, and print a per-stage timing report.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Headless batch run of the dwell time and compliance pipeline.",
+    )
+    parser.add_argument("open_dock", help="Open Dock report CSV")
+    parser.add_argument("open_order", help="Open Order report CSV")
+    parser.add_argument("trailer_activity", help="Trailer Activity report CSV")
+    parser.add_argument("-o", "--output-dir", default="output", help="directory for the outputs (default: output)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="parquet", help="output file format (default: parquet)")
+    parser.add_argument("--engine", choices=["pandas", "duckdb"], default="pandas", help="clean and merge engine (default: pandas)")
+    parser.add_argument("--stream", action="store_true",
+                        help="clean Trailer Activity block by block into a Parquet dataset instead of loading it whole")
+    parser.add_argument("--store", metavar="DIR",
+                        help="add Open Order and Trailer Activity to this shipment store and report on the whole store")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="also print the merged dataset's bytes per column before and after the compact dtypes")
+    args = parser.parse_args(argv)
+    if args.stream and args.engine != "pandas":
+        parser.error("--stream is only supported with the pandas engine")
+    if args.store and (args.stream or args.engine != "pandas"):
+        parser.error("--store cannot be combined with --stream or --engine duckdb")
+    if args.memory_report and (args.stream or args.store):
+        parser.error("--memory-report cannot be combined with --stream or --store")
+
+    timings, report = run_pipeline(args.open_dock, args.open_order, args.trailer_activity, args.output_dir,
+                                   output_format=args.format, engine=args.engine, stream=args.stream,
+                                   store_dir=args.store, report_memory=args.memory_report)
+    print(format_timings(timings))
+    if report is not None:
+        print()
+        print(format_memory_report(report))
+    return 0
+
+def run_pipeline(open_dock_path, open_order_path, trailer_activity_path, output_dir,
+                 output_format="parquet", engine="pandas", stream=False, store_dir=None, report_memory=False):
+    """
+    Run read, clean, merge, rollup and pivots for the three reports and write the results.
+    With stream=True, Trailer Activity is cleaned block by block into output_dir/trailer_activity_cleaned
+    so it never has to fit in memory. With store_dir, Open Order and Trailer Activity are ingested into
+    that shipment store and the outputs cover everything it holds.
+    Returns (timings, report): a list of (stage, seconds, rows) tuples, and with report_memory=True the
+    memory_report of the merged dataset in the pandas engine's loose dtypes and after compact_compliance
+    (None otherwise).
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of {OUTPUT_FORMATS}.")
+    # Stages are timed by the shared profiler; the report lists the outermost ones
+    with profiling() as records:
+        merged_df, loose_df = _run_stages(open_dock_path, open_order_path, trailer_activity_path, output_dir,
+                                          output_format, engine, stream, store_dir, report_memory)
+    timings = [(record["stage"], record["seconds"], record["rows_out"] or 0) for record in records if record["depth"] == 0]
+
+    return timings, memory_report(loose_df, merged_df) if report_memory else None
+
+def format_timings(timings):
+    """
+    Render (stage, seconds, rows) tuples as a plain-text table with a total line.
+    """
+    width = max(len(name) for name, _, _ in timings + [("total", 0, 0)])
+    lines = [f"{'Stage':<{width}}  {'Seconds':>9}  {'Rows':>10}"]
+    for name, seconds, rows in timings:
+        lines.append(f"{name:<{width}}  {seconds:>9.3f}  {rows:>10,}")
+    lines.append(f"{'total':<{width}}  {sum(seconds for _, seconds, _ in timings):>9.3f}")
+    return "\n".join(lines)
+
+def _run_stages(open_dock_path, open_order_path, trailer_activity_path, output_dir,
+                output_format, engine, stream, store_dir, report_memory):
+    # The stages of run_pipeline; returns the merged dataset and, for report_memory, its loose version
+    loose_df = None
+    with profile_stage("read open_dock") as stage:
+        od_df = stage(read_report(open_dock_path, "open_dock"))
+    with profile_stage("read open_order") as stage:
+        oo_df = stage(read_report(open_order_path, "open_order"))
+    if not stream:
+        with profile_stage("read trailer_activity") as stage:
+            ta_df = stage(read_report(trailer_activity_path, "trailer_activity"))
+
+    with profile_stage("clean open_dock") as stage:
+        no_show_data = stage(clean_open_dock_no_shows(od_df))
+    if store_dir:
+        delta_id = f"{file_digest(open_order_path)}-{file_digest(trailer_activity_path)}"
+        with profile_stage("ingest into shipment store") as stage:
+            stage(ingest_reports(oo_df, ta_df, store_dir, delta_id=delta_id,
+                                 no_show_data=no_show_data, no_show_id=file_digest(open_dock_path)))
+        with profile_stage("load shipment store") as stage:
+            merged_df = stage(load_compliance(store_dir))
+            # No Shows of every Open Dock file in the store, to match the compliance history
+            stored_no_shows = load_no_shows(store_dir)
+            if stored_no_shows is not None:
+                no_show_data = stored_no_shows
+    elif stream:
+        ta_dir = os.path.join(output_dir, "trailer_activity_cleaned")
+        with profile_stage("stream clean trailer_activity") as stage:
+            stage(clean_trailer_activity_to_parquet(trailer_activity_path, ta_dir))
+        with profile_stage("clean open_order and merge") as stage:
+            merged_df = stage(merge_compliance(clean_open_order(oo_df), ta_dir))
+    else:
+        with profile_stage("clean and merge compliance") as stage:
+            merged_df = clean_and_merge_compliance(oo_df, ta_df, engine=engine, compact=not report_memory)
+            if isinstance(merged_df, pa.Table):
+                merged_df = compact_compliance(merged_df.to_pandas())
+            elif report_memory:
+                # Keep the pandas engine's loose output to measure the compact dtypes against
+                loose_df, merged_df = merged_df, compact_compliance(merged_df)
+            stage(merged_df)
+        if report_memory and engine != "pandas":
+            # The DuckDB engine returns compact types, so the loose frame is rebuilt from them
+            loose_df = uncompact_compliance(merged_df)
+    with profile_stage("build rollup") as stage:
+        rollup = build_rollup(merged_df, no_show_data)
+        stage(rollup['compliance_rollup'])
+
+    with profile_stage("summarize pivots") as stage:
+        pivots = {period: summarize_rollup(rollup, period) for period in PERIODS}
+        stage(rollup['compliance_rollup'])
+
+    with profile_stage("write outputs") as stage:
+        os.makedirs(output_dir, exist_ok=True)
+        _write(no_show_data, os.path.join(output_dir, "no_show_data"), output_format)
+        _write(merged_df, os.path.join(output_dir, "dwell_and_ontime_compliance"), output_format)
+        for period, summaries in pivots.items():
+            if summaries is None:
+                continue
+            period_dir = os.path.join(output_dir, "pivots", period.lower().replace(" ", "_"))
+            os.makedirs(period_dir, exist_ok=True)
+            for name, pivot in summaries.items():
+                _write(pivot, os.path.join(period_dir, name), output_format)
+        stage(merged_df)
+
+    return merged_df, loose_df
+
+def _write(df, path, output_format):
+    if output_format == "parquet":
+        df.to_parquet(f"{path}.parquet", index=False)
+    else:
+        df.to_csv(f"{path}.csv", index=False)
+
+if __name__ == "__main__":
+    sys.exit(main())
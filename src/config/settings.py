@@ -1,3 +1,24 @@
 APP_TITLE = "Bradshaw Dwell Time Dashboard"
 LOGS_PATH = "logs/"
-VERSION = '_Alpha V.4.1.2'
\ No newline at end of file
+CACHE_PATH = "cache/"
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+VERSION = '_Alpha V.4.1.2'
+# Worker processes used next to the app process when cleaning large uploads (0 cleans serially)
+CLEANING_WORKERS = 2
+PARALLEL_MIN_ROWS = 250_000
+STREAM_BLOCK_SIZE = 64 * 1024 ** 2
+SHIPMENT_STORE_PATH = "store/"
+# Optional DuckDB warehouse file for the cleaned datasets, e.g. "warehouse/dashboard.duckdb". None
+# keeps the Parquet cache. Merges always join in private in-memory databases. Only one process can
+# open the file for writing at a time.
+WAREHOUSE_PATH = None
+WAREHOUSE_MAX_DATASETS = 5
+# Measure peak memory per stage in the Pipeline profile. Uses tracemalloc, which slows cleaning
+# down about 3-4x and counts the allocations of every session in the process. It only sees Python
+# and NumPy allocations: the memory Arrow (CSV parsing, timestamps) and DuckDB (joins, the DuckDB
+# engine) allocate themselves is not counted.
+PROFILE_MEMORY = False
+# Write raw uploads to temporary Parquet files once they are cleaned and read them back only if
+# they have to be cleaned again. Saves holding the full uploads in memory for every session.
+LEAN_UPLOADS = False
+UPLOAD_SPILL_PATH = None  # None uses the system temp directory
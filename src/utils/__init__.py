@@ -1,8 +1,16 @@
 from .cleaning_utils import (
     clean_open_dock_no_shows,
     clean_open_order,
+    clean_open_order_rows,
+    combine_open_order_rows,
     clean_trailer_activity,
     clean_and_merge_compliance,
+    merge_compliance,
+    compact_compliance,
+    uncompact_compliance,
     calculate_dwell_time,  # Include this
+    compute_dwell_time,
+    compute_required_time,
+    compute_compliance,
 )
 
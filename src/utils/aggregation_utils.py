@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+# Dwell Time buckets shown on every dashboard
+DWELL_BINS = [0, 2, 3, 4, 5, float('inf')]
+DWELL_LABELS = ['less than 2 hours', '2 to 3 hours', '3 to 4 hours', '4 to 5 hours', '5 or more hours']
+COMPLIANCE_COLUMNS = ['Late', 'On Time']
+
+# Periods a dashboard can summarize by
+PERIODS = ['Scheduled Date', 'Week', 'Month', 'Year']
+
+def dwell_category(dwell_time):
+    """
+    Bin Dwell Time (hours) into the dashboard categories.
+    """
+    return pd.cut(dwell_time, bins=DWELL_BINS, labels=DWELL_LABELS, right=False)
+
+def period_values(compliance_data, period):
+    """
+    Period key for each row of the merged compliance data.
+    """
+    if period == 'Year':
+        return pd.Series(pd.DatetimeIndex(compliance_data['Scheduled Date']).year, index=compliance_data.index, name='Year')
+    return compliance_data[period]
+
+def no_show_period_values(no_show_data, period):
+    """
+    Period key for each row of the No Show data.
+    """
+    appointment = no_show_data['appointment datetime']
+    if period == 'Scheduled Date':
+        return appointment.dt.normalize().rename('Scheduled Date')
+    if period == 'Year':
+        return pd.Series(pd.DatetimeIndex(appointment).year, index=no_show_data.index, name='Year')
+    return no_show_data[period]
+
+def group_compliance(compliance_data, period):
+    """
+    One grouped pass over the merged compliance data: shipment counts and Dwell Time sums
+    by period, carrier, visit type, compliance and dwell category. Every dashboard summary
+    is derived from this small frame.
+    """
+    # Dwell Time is stored as float32; sum the 2-decimal hours in float64 so averages stay exact
+    dwell_time = compliance_data['Dwell Time'].astype('float64').round(2)
+    keys = [
+        period_values(compliance_data, period).rename(period),
+        compliance_data['Carrier'],
+        compliance_data['Visit Type'],
+        compliance_data['Compliance'],
+        dwell_category(dwell_time).rename('Dwell Time Category'),
+    ]
+    grouped = dwell_time.groupby(keys, observed=True, dropna=False).agg(['size', 'count', 'sum'])
+    grouped = grouped.rename(columns={
+        'size': 'Shipments',
+        'count': 'Dwell Count',
+        'sum': 'Dwell Sum',
+    }).reset_index()
+
+    # Plain labels, so pivots only list the carriers and visit types of the selection
+    for col in ['Carrier', 'Visit Type', 'Compliance']:
+        grouped[col] = grouped[col].astype(object)
+    return grouped
+
+def summarize_compliance(compliance_data, no_show_data, period, selected=None):
+    """
+    Build the four dashboard pivots for a period. With selected set, only that period is kept
+    (a date, week number or month number); otherwise every period is summarized.
+    Returns a dict with 'period', 'carrier', 'dwell' and 'dwell_average' tables,
+    or None when there is no compliance data to summarize.
+    """
+    no_show_periods = no_show_period_values(no_show_data, period)
+    if selected is not None:
+        compliance_data = compliance_data[period_values(compliance_data, period) == selected]
+        no_show_periods = no_show_periods[no_show_periods == selected]
+    if compliance_data.empty:
+        return None
+
+    return _summarize_grouped(group_compliance(compliance_data, period), period, no_show_periods.value_counts())
+
+def build_rollup(compliance_data, no_show_data):
+    """
+    Pre-aggregate the cleaned datasets once at clean time: shipment counts and Dwell Time sums by
+    (date, carrier, visit type, compliance, dwell category), and No Show counts by date.
+    Week, Month and Year are attached to each date so every dashboard period is a slice of the rollup.
+    Both frames are sorted by date.
+    """
+    compliance_rollup = _add_period_columns(group_compliance(compliance_data, 'Scheduled Date'))
+
+    no_show_rollup = no_show_period_values(no_show_data, 'Scheduled Date').value_counts(sort=False).sort_index()
+    no_show_rollup = _add_period_columns(no_show_rollup.rename_axis('Scheduled Date').reset_index(name='No Show'))
+
+    return {
+        'compliance_rollup': compliance_rollup,
+        'no_show_rollup': no_show_rollup,
+    }
+
+def build_period_index(rollup):
+    """
+    For each rollup frame and period, the period keys in sorted order and the row positions
+    that sort them. Lets summarize_rollup find a selected period by binary search.
+    """
+    index = {}
+    for name in ['compliance_rollup', 'no_show_rollup']:
+        for period in PERIODS:
+            keys = rollup[name][period].to_numpy()
+            # Stable, so rows of one period keep their date order
+            order = np.argsort(keys, kind='stable')
+            index[(name, period)] = (pd.Index(keys[order]), order)
+    return index
+
+def summarize_rollup(rollup, period, selected=None):
+    """
+    Same as summarize_compliance, answered from a rollup built by build_rollup.
+    Cost depends on the number of rollup rows, not on shipment volume. When the rollup
+    carries a 'period_index' (see build_period_index), a selected period is found by
+    binary search instead of a scan.
+    """
+    compliance_rollup = rollup['compliance_rollup']
+    no_show_rollup = rollup['no_show_rollup']
+    if selected is not None:
+        period_index = rollup.get('period_index') or build_period_index(rollup)
+        if period == 'Scheduled Date':
+            selected = pd.Timestamp(selected)
+        compliance_rollup = _select_period(compliance_rollup, period_index[('compliance_rollup', period)], selected)
+        no_show_rollup = _select_period(no_show_rollup, period_index[('no_show_rollup', period)], selected)
+    if compliance_rollup.empty:
+        return None
+
+    no_show_counts = no_show_rollup.groupby(period)['No Show'].sum()
+    return _summarize_grouped(compliance_rollup, period, no_show_counts)
+
+def _select_period(df, index, selected):
+    # Rows of one period: a binary search over the sorted keys, then a take of their positions
+    keys, order = index
+    start = keys.searchsorted(selected, side='left')
+    stop = keys.searchsorted(selected, side='right')
+    return df.iloc[order[start:stop]]
+
+def _summarize_grouped(grouped, period, no_show_counts):
+    return {
+        'period': compliance_by_period(grouped, period, no_show_counts),
+        'carrier': compliance_by_carrier(grouped),
+        'dwell': compliance_by_dwell_category(grouped),
+        'dwell_average': average_dwell_by_visit_type(grouped),
+    }
+
+def _add_period_columns(df):
+    # Week, Month and Year of each 'Scheduled Date', typed like the merged compliance dataset
+    dates = pd.DatetimeIndex(pd.to_datetime(df['Scheduled Date']))
+    df['Week'] = dates.isocalendar().week.to_numpy(dtype='uint8')
+    df['Month'] = dates.month.astype('uint8')
+    df['Year'] = dates.year
+    return df
+
+def compliance_by_period(grouped, period, no_show_counts):
+    """
+    On Time compliance counts per period with No Show counts, Grand Total and On Time %.
+    """
+    pivot = _count_pivot(grouped, period)
+    pivot['No Show'] = pivot[period].map(no_show_counts).fillna(0).astype(int)
+    pivot['Grand Total'] = pivot[COMPLIANCE_COLUMNS].sum(axis=1) + pivot['No Show']
+    pivot['On Time %'] = round((pivot['On Time'] / pivot['Grand Total']) * 100, 2)
+
+    # Show dates without a time of day in the table and the Excel export
+    if period == 'Scheduled Date':
+        pivot[period] = pivot[period].dt.date
+    return pivot
+
+def compliance_by_carrier(grouped):
+    """
+    On Time compliance counts per carrier, sorted by On Time % (descending order).
+    """
+    pivot = _count_pivot(grouped, 'Carrier')
+    pivot['Grand Total'] = pivot[COMPLIANCE_COLUMNS].sum(axis=1)
+    pivot['On Time %'] = round((pivot['On Time'] / pivot['Grand Total']) * 100, 2)
+    return pivot.sort_values(by='On Time %', ascending=False)
+
+def compliance_by_dwell_category(grouped):
+    """
+    Late and On Time counts per Dwell Time category with their share of the category total.
+    """
+    pivot = _count_pivot(grouped, 'Dwell Time Category')
+    pivot['Grand Total'] = pivot[COMPLIANCE_COLUMNS].sum(axis=1)
+    pivot['Late % of Total'] = round((pivot['Late'] / pivot['Grand Total']) * 100, 2)
+    pivot['On Time % of Total'] = round((pivot['On Time'] / pivot['Grand Total']) * 100, 2)
+    return pivot
+
+def average_dwell_by_visit_type(grouped):
+    """
+    Average Dwell Time per visit type and compliance, with a Grand Average column and row.
+    """
+    totals = grouped.groupby(['Visit Type', 'Compliance'])[['Dwell Sum', 'Dwell Count']].sum()
+
+    # Groups without any Dwell Time are left out, as pivot_table drops all-NaN means
+    totals = totals[totals['Dwell Count'] > 0]
+    pivot = (totals['Dwell Sum'] / totals['Dwell Count']).unstack('Compliance').reset_index()
+
+    # Ensure required columns are present
+    for col in COMPLIANCE_COLUMNS:
+        if col not in pivot.columns:
+            pivot[col] = 0
+
+    # Add Grand Average
+    pivot['Grand Average'] = pivot.select_dtypes(include=[np.number]).mean(axis=1)
+
+    # Add Overall Grand Average Row
+    grand_avg_row = pivot.select_dtypes(include=[np.number]).mean().to_frame().T
+    grand_avg_row['Visit Type'] = 'Grand Average'
+    return pd.concat([pivot, grand_avg_row], ignore_index=True)
+
+def _count_pivot(grouped, index):
+    # Shipment counts by index and compliance, with both compliance columns always present
+    pivot = grouped.pivot_table(
+        values='Shipments',
+        index=index,
+        columns='Compliance',
+        aggfunc='sum',
+        fill_value=0,
+        observed=False,
+    ).reset_index()
+
+    for col in COMPLIANCE_COLUMNS:
+        if col not in pivot.columns:
+            pivot[col] = 0
+    return pivot
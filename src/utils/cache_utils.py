@@ -0,0 +1,93 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from src.config.settings import CACHE_MAX_BYTES, CACHE_PATH
+from src.utils.cleaning_utils import CLEANING_VERSION
+
+# Uploads that make up one cleaned dataset, in key order
+UPLOAD_NAMES = ["open_dock", "open_order", "trailer_activity"]
+
+def dataset_cache_key(file_hashes, version=CLEANING_VERSION):
+    """
+    Cache key for the cleaned datasets built from a set of uploads.
+    Combines the raw file hashes with the cleaning-logic version.
+    """
+    digest = hashlib.sha256(f"cleaning-v{version}".encode())
+    for name in UPLOAD_NAMES:
+        digest.update(f"|{name}={file_hashes[name]}".encode())
+    return digest.hexdigest()
+
+def load_cleaned_datasets(cache_key, names, cache_dir=CACHE_PATH):
+    """
+    Load the named cached datasets as a dict of DataFrames, or None on a cache miss.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key)
+    paths = {name: os.path.join(entry_dir, f"{name}.parquet") for name in names}
+    if not all(os.path.isfile(path) for path in paths.values()):
+        return None
+
+    try:
+        datasets = {name: pd.read_parquet(path) for name, path in paths.items()}
+    except (OSError, ValueError):
+        # Unreadable entry: drop it and rebuild
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+    # Mark as recently used for LRU eviction
+    os.utime(entry_dir)
+    return datasets
+
+def save_cleaned_datasets(cache_key, datasets, cache_dir=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+    """
+    Store cleaned datasets (dict of name -> DataFrame) as Parquet under cache_key,
+    then evict least recently used entries until the cache fits in max_bytes.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_dir = os.path.join(cache_dir, cache_key)
+
+    # Write into a temporary directory and rename so readers never see a partial entry
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=cache_dir)
+    try:
+        for name, df in datasets.items():
+            df.to_parquet(os.path.join(staging_dir, f"{name}.parquet"))
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(staging_dir, entry_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    evict_cache(cache_dir, max_bytes, keep=cache_key)
+
+def evict_cache(cache_dir=CACHE_PATH, max_bytes=CACHE_MAX_BYTES, keep=None):
+    """
+    Remove least recently used cache entries until the total size is within max_bytes.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        if name.startswith(".") or not os.path.isdir(entry_dir):
+            continue
+        entries.append((os.path.getmtime(entry_dir), _directory_size(entry_dir), name, entry_dir))
+
+    total_bytes = sum(size for _, size, _, _ in entries)
+    for _, size, name, entry_dir in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total_bytes -= size
+
+def _directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, file_name))
+        for root, _, file_names in os.walk(path)
+        for file_name in file_names
+    )
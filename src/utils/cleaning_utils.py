@@ -1,27 +1,78 @@
+import os
 import pandas as pd
 import numpy as np
 import duckdb
 
+from src.utils.datetime_utils import parse_datetime_column
+from src.utils.profiling import profile_stage, profiled
+from src.utils.shipment_ids import normalize_shipment_ids, shipment_keys
+
+# Bump whenever the cleaning rules change so cached cleaned datasets are rebuilt
+CLEANING_VERSION = "3"
+
+# Grace window after the appointment before a check-in counts as Late
+GRACE_PERIODS = {
+    'Live Load': pd.Timedelta(minutes=15),
+    'Pickup Load': pd.Timedelta(hours=24),
+}
+DEFAULT_GRACE_PERIOD = pd.Timedelta(hours=24)
+COMPLIANCE_CATEGORIES = ['On Time', 'Late']
+
+# Raw columns each cleaner keeps
+OPEN_DOCK_COLUMNS = ['appt date', 'appointment datetime', 'direction', 'status']
+OPEN_ORDER_COLUMNS = ['Appt Date and Time', 'SO #', 'Shipment Nbr', 'Order Status']
+TRAILER_ACTIVITY_COLUMNS = [
+    'CHECKIN DATE TIME', 'APPOINTMENT DATE TIME', 'CHECKOUT DATE TIME',
+    'CARRIER', 'VISIT TYPE', 'ACTIVITY TYPE', 'SHIPMENT_ID', 'Date/Time'
+]
+
+# Raw timestamp columns for each report
+OPEN_DOCK_DATETIME_COLUMNS = ['appt date', 'appointment datetime']
+OPEN_ORDER_DATETIME_COLUMNS = ['Appt Date and Time']
+TRAILER_ACTIVITY_DATETIME_COLUMNS = ['CHECKIN DATE TIME', 'APPOINTMENT DATE TIME', 'CHECKOUT DATE TIME', 'Date/Time']
+
+# Compact dtypes for the merged compliance dataset. Shipment ID and SO Number are close to unique
+# per row, so a categorical would not save anything and they stay object strings.
+COMPLIANCE_DTYPES = {
+    'Carrier': 'category',
+    'Visit Type': 'category',
+    'Compliance': pd.CategoricalDtype(COMPLIANCE_CATEGORIES),
+    'Dwell Time': 'float32',
+    'Scheduled Date': 'datetime64[ns]',
+    'Week': 'uint8',
+    'Month': 'uint8',
+}
+
+# Carriers that are not tracked for dwell and on-time compliance
+CARRIERS_TO_EXCLUDE = [
+    'AACT', 'DIMS', 'EXLA', 'SAIA', 'FXFE', 'FXLA', 'FXNL', 'F106', 'F107',
+    'F109', 'F110', 'F111', 'F112', 'F117', 'ODFL', 'U743', 'U746', 'U748', 'VQXX', 'CTII'
+]
+
 # Cleaning Open Dock for No Show Data Set
+@profiled("clean_open_dock_no_shows")
 def clean_open_dock_no_shows(od_df):
-    import streamlit as st
+    # Work on a shallow copy so the caller's frame keeps its headers
+    od_df = od_df.copy(deep=False)
+
     # Standardize column names by stripping whitespace and lowercasing
     od_df.columns = od_df.columns.str.strip().str.lower()
 
     # Rename columns for consistency
     od_df.rename(columns={"appt date": "appointment datetime"}, inplace=True)
 
-    # Filter for non-Inbound rows
-    if "direction" in od_df.columns:
-        od_df = od_df[od_df["direction"].str.lower() != "inbound"]
-    else:
-        raise KeyError("'Direction' column is missing in the Open Dock CSV.")
+    with profile_stage("open_dock: filter direction and status", od_df) as stage:
+        # Filter for non-Inbound rows
+        if "direction" in od_df.columns:
+            od_df = od_df[od_df["direction"].str.lower() != "inbound"]
+        else:
+            raise KeyError("'Direction' column is missing in the Open Dock CSV.")
 
-    # Keep only rows where 'Status' is 'Completed' or 'NoShow'
-    if "status" in od_df.columns:
-        od_df = od_df[od_df["status"].isin(["Completed", "NoShow"])]
-    else:
-        raise KeyError("'Status' column is missing in the Open Dock CSV.")
+        # Keep only rows where 'Status' is 'Completed' or 'NoShow'
+        if "status" in od_df.columns:
+            od_df = stage(od_df[od_df["status"].isin(["Completed", "NoShow"])])
+        else:
+            raise KeyError("'Status' column is missing in the Open Dock CSV.")
 
     # Select relevant columns
     if "appointment datetime" in od_df.columns and "status" in od_df.columns:
@@ -30,7 +81,9 @@ def clean_open_dock_no_shows(od_df):
         raise KeyError("Required columns 'appointment datetime' or 'status' are missing after cleaning.")
 
     # Set data types
-    no_show_data['appointment datetime'] = pd.to_datetime(no_show_data['appointment datetime'], errors='coerce')
+    with profile_stage("open_dock: parse appointments", no_show_data) as stage:
+        no_show_data['appointment datetime'] = parse_datetime_column(no_show_data['appointment datetime'])
+        stage(no_show_data)
     no_show_data['status'] = no_show_data['status'].astype(str)
 
     no_show_data = no_show_data[no_show_data['status'] != 'Completed']
@@ -38,110 +91,169 @@ def clean_open_dock_no_shows(od_df):
     no_show_data['Week'] = no_show_data['appointment datetime'].dt.isocalendar().week
     no_show_data['Month'] = no_show_data['appointment datetime'].dt.month
 
-    # Save no_show_data in session state
-    if 'no_show_data' not in st.session_state:
-        st.session_state['no_show_data'] = no_show_data
-
-    return no_show_data
+    # Latest appointments first, like the merged compliance dataset
+    with profile_stage("open_dock: sort by appointment", no_show_data) as stage:
+        return stage(no_show_data.sort_values(by='appointment datetime', ascending=False, kind='stable'))
 
 # Cleaning Open Order CSV
+@profiled("clean_open_order")
 def clean_open_order(oo_df):
+    return combine_open_order_rows(clean_open_order_rows(oo_df))
+
+def clean_open_order_rows(oo_df):
+    """
+    Shipped Open Order rows with a parsed appointment and normalized 'SO #' and 'Shipment Nbr',
+    before they are combined per shipment.
+    """
+    oo_df = oo_df.copy(deep=False)
     oo_df.columns = oo_df.columns.str.strip()
 
     # Keep necessary columns
-    columns_to_keep = ['Appt Date and Time', 'SO #', 'Shipment Nbr', 'Order Status']
-    oo_df = oo_df[columns_to_keep]
+    oo_df = oo_df[OPEN_ORDER_COLUMNS]
 
     # Clean 'Appt Date and Time'
-    oo_df['Appt Date and Time'] = pd.to_datetime(oo_df['Appt Date and Time'].str.strip(), errors='coerce')
-    oo_df = oo_df.dropna(subset=['Appt Date and Time'])
+    with profile_stage("open_order: parse appointments", oo_df) as stage:
+        oo_df['Appt Date and Time'] = parse_datetime_column(oo_df['Appt Date and Time'])
+        oo_df = stage(oo_df.dropna(subset=['Appt Date and Time']))
 
     # Clean 'SO #' and 'Shipment Nbr'
-    oo_df['SO #'] = oo_df['SO #'].astype(str).str.strip()
-    oo_df['Shipment Nbr'] = oo_df['Shipment Nbr'].astype(str).str.replace(',', '').str.extract(r'(\d+)', expand=False).fillna('')
-    
+    with profile_stage("open_order: extract shipment ids", oo_df) as stage:
+        # Missing SO numbers read as NaN, None or <NA> depending on the reader; all become 'nan'
+        so_numbers = oo_df['SO #']
+        oo_df['SO #'] = so_numbers.astype(str).str.strip().where(so_numbers.notna(), 'nan')
+        oo_df['Shipment Nbr'] = normalize_shipment_ids(oo_df['Shipment Nbr'])
+        stage(oo_df)
+
     # Filter for 'shipped' orders
-    oo_df = oo_df[oo_df['Order Status'].str.strip().str.lower() == 'shipped']
+    with profile_stage("open_order: filter shipped", oo_df) as stage:
+        return stage(oo_df[oo_df['Order Status'].str.strip().str.lower() == 'shipped'])
 
-    # Combine SO Numbers for the same Shipment Nbr
-    oo_df = oo_df.groupby('Shipment Nbr', as_index=False).agg({
-        'Appt Date and Time': 'first',
-        'SO #': lambda x: ', '.join(sorted(set(x))),
+@profiled("open_order: combine SO numbers")
+def combine_open_order_rows(oo_df):
+    """
+    One row per shipment from cleaned Open Order rows: the first appointment and the sorted,
+    distinct SO Numbers. Vectorized; matches grouping with ', '.join(sorted(set(x))) per shipment.
+    """
+    ship_codes, shipment_ids = _sorted_factorize(oo_df['Shipment Nbr'])
+    so_codes, so_numbers = _sorted_factorize(oo_df['SO #'])
+
+    # First appointment of each shipment, in row order
+    first_row = np.full(len(shipment_ids), len(ship_codes), dtype=np.intp)
+    np.minimum.at(first_row, ship_codes, np.arange(len(ship_codes)))
+    first_appt = oo_df['Appt Date and Time'].to_numpy()[first_row]
+
+    # Sort rows by shipment, then SO Number, and drop repeated SO Numbers of a shipment
+    order = np.lexsort((so_codes, ship_codes))
+    ship_codes, so_codes = ship_codes[order], so_codes[order]
+    new_shipment = np.diff(ship_codes, prepend=-1) != 0
+    keep = new_shipment | (np.diff(so_codes, prepend=-1) != 0)
+    so_codes, new_shipment = so_codes[keep], new_shipment[keep]
+
+    # Combine SO Numbers for the same Shipment Nbr: each run of sorted SO Numbers is summed as strings
+    parts = np.where(new_shipment, '', ', ').astype(object) + so_numbers[so_codes]
+    combined = np.add.reduceat(parts, np.flatnonzero(new_shipment)) if len(parts) else parts
+
+    return pd.DataFrame({
+        'Shipment ID': shipment_ids,
+        'Appt DateTime': first_appt,
+        'SO Number': combined,
     })
 
-    oo_df.rename(columns={
-        'Shipment Nbr': 'Shipment ID',
-        'Appt Date and Time': 'Appt DateTime',
-        'SO #': 'SO Number'
-    }, inplace=True)
-
-    return oo_df
+def _sorted_factorize(values):
+    # Codes numbered in sorted order of the distinct values, compared as strings like sorted()
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+    order = np.argsort(uniques.astype(str), kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[codes], uniques[order]
 
 # Cleaning Trailer Activity CSV
+@profiled("clean_trailer_activity")
 def clean_trailer_activity(ta_df):
+    ta_df = ta_df.copy(deep=False)
     ta_df.columns = ta_df.columns.str.strip()
 
     # Keep necessary columns
-    columns_to_keep = [
-        'CHECKIN DATE TIME', 'APPOINTMENT DATE TIME', 'CHECKOUT DATE TIME',
-        'CARRIER', 'VISIT TYPE', 'ACTIVITY TYPE', 'SHIPMENT_ID', 'Date/Time'
-    ]
-    ta_df = ta_df[columns_to_keep]
+    ta_df = ta_df[TRAILER_ACTIVITY_COLUMNS]
 
     # Filter for activity type and visit type
-    ta_df = ta_df[(ta_df['ACTIVITY TYPE'] == 'CLOSED') &
-                  (ta_df['VISIT TYPE'].isin(['Pickup Load', 'Live Load']))]
+    with profile_stage("trailer_activity: filter closed loads", ta_df) as stage:
+        ta_df = stage(ta_df[(ta_df['ACTIVITY TYPE'] == 'CLOSED') &
+                            (ta_df['VISIT TYPE'].isin(['Pickup Load', 'Live Load']))])
 
-    # Clean 'SHIPMENT_ID'
-    ta_df['SHIPMENT_ID'] = ta_df['SHIPMENT_ID'].astype(str).str.replace(',', '').str.extract(r'(\d+)', expand=False).fillna('')
+    # Key 'SHIPMENT_ID' for the join; the merged dataset takes the Shipment ID text from Open Order
+    with profile_stage("trailer_activity: extract shipment ids", ta_df) as stage:
+        ta_df['SHIPMENT_ID'] = shipment_keys(ta_df['SHIPMENT_ID'])
+        stage(ta_df)
 
     # Convert date/time columns
-    datetime_columns = ['CHECKIN DATE TIME', 'APPOINTMENT DATE TIME', 'CHECKOUT DATE TIME', 'Date/Time']
-    for col in datetime_columns:
-        ta_df[col] = pd.to_datetime(ta_df[col].str.strip(), errors='coerce')
-
-    # Drop rows with invalid dates
-    ta_df = ta_df.dropna(subset=['APPOINTMENT DATE TIME', 'CHECKIN DATE TIME', 'CHECKOUT DATE TIME'])
-
-    # Calculate 'Required Time'
-    def required_time(row):
-        if row['VISIT TYPE'] == 'Live Load':
-            return row['APPOINTMENT DATE TIME'] + pd.Timedelta(minutes=15)
-        return row['APPOINTMENT DATE TIME'] + pd.Timedelta(hours=24)
-
-    ta_df['Required Time'] = ta_df.apply(required_time, axis=1)
+    with profile_stage("trailer_activity: parse datetimes", ta_df) as stage:
+        for col in TRAILER_ACTIVITY_DATETIME_COLUMNS:
+            ta_df[col] = parse_datetime_column(ta_df[col])
 
-    # Determine Compliance
-    def compliance(row):
-        if row['CHECKIN DATE TIME'] <= row['Required Time']:
-            return 'On Time'
-        return 'Late'
+        # Drop rows with invalid dates
+        ta_df = stage(ta_df.dropna(subset=['APPOINTMENT DATE TIME', 'CHECKIN DATE TIME', 'CHECKOUT DATE TIME']))
 
-    ta_df['Compliance'] = ta_df.apply(compliance, axis=1)
+    # Calculate 'Required Time' and determine Compliance
+    with profile_stage("trailer_activity: compliance", ta_df) as stage:
+        ta_df['Required Time'] = compute_required_time(ta_df['APPOINTMENT DATE TIME'], ta_df['VISIT TYPE'])
+        ta_df['Compliance'] = compute_compliance(ta_df['CHECKIN DATE TIME'], ta_df['Required Time'])
+        stage(ta_df)
 
     ta_df.rename(columns={
         'CHECKIN DATE TIME': 'Checkin DateTime',
         'CHECKOUT DATE TIME': 'Checkout DateTime',
         'CARRIER': 'Carrier',
         'VISIT TYPE': 'Visit Type',
-        'SHIPMENT_ID': 'Shipment ID',
+        'SHIPMENT_ID': 'Shipment Key',
         'Date/Time': 'Loaded DateTime'
     }, inplace=True)
 
     return ta_df
 
+def compute_required_time(appointment, visit_type):
+    """
+    Add the grace window for each visit type to the appointment times.
+    """
+    grace = visit_type.map(GRACE_PERIODS).fillna(DEFAULT_GRACE_PERIOD)
+    return appointment + pd.to_timedelta(grace)
+
+def compute_compliance(checkin, required_time):
+    """
+    Label each check-in 'On Time' or 'Late' against its required time.
+    """
+    labels = np.where(checkin <= required_time, 'On Time', 'Late')
+    return pd.Series(pd.Categorical(labels, categories=COMPLIANCE_CATEGORIES), index=checkin.index)
+
 # Merging Cleaned Data
-def clean_and_merge_compliance(oo_df, ta_df):
-    cleaned_open_order = clean_open_order(oo_df)
-    cleaned_trailer_activity = clean_trailer_activity(ta_df)
+@profiled("clean_and_merge_compliance")
+def clean_and_merge_compliance(oo_df, ta_df, engine="pandas", compact=True):
+    """
+    Clean Open Order and Trailer Activity and merge them into the dwell and compliance dataset.
+    engine="pandas" returns a DataFrame in the COMPLIANCE_DTYPES schema (compact=False keeps the
+    loose object/float64 dtypes); engine="duckdb" runs the whole pipeline as one DuckDB query
+    and returns an Arrow table.
+    """
+    if engine == "duckdb":
+        from src.utils.duckdb_pipeline import clean_and_merge_compliance_duckdb
+        return clean_and_merge_compliance_duckdb(oo_df, ta_df)
+    if engine != "pandas":
+        raise ValueError(f"Unknown engine '{engine}'. Expected 'pandas' or 'duckdb'.")
 
-    # Merge datasets using DuckDB
-    con = duckdb.connect(":memory:")
-    con.register("open_order", cleaned_open_order)
-    con.register("trailer_activity", cleaned_trailer_activity)
+    return merge_compliance(clean_open_order(oo_df), clean_trailer_activity(ta_df), compact=compact)
 
+@profiled("merge_compliance")
+def merge_compliance(cleaned_open_order, cleaned_trailer_activity, compact=True):
+    """
+    Merge cleaned Open Order and Trailer Activity into the dwell and compliance dataset,
+    joining on the int64 'Shipment Key' of shipment_ids.shipment_keys.
+    cleaned_trailer_activity may also be the directory of a Parquet dataset written by
+    streaming_pipeline.clean_trailer_activity_to_parquet; DuckDB then scans it from disk.
+    """
     query = """
     SELECT 
+        open_order."Shipment Key",
         open_order."Shipment ID",
         open_order."SO Number",
         open_order."Appt DateTime",
@@ -154,25 +266,41 @@ def clean_and_merge_compliance(oo_df, ta_df):
         trailer_activity."Compliance"
     FROM open_order
     LEFT JOIN trailer_activity
-    ON open_order."Shipment ID" = trailer_activity."Shipment ID"
+    ON open_order."Shipment Key" = trailer_activity."Shipment Key"
     """
 
-    merged_df = con.execute(query).fetchdf()
+    # Open Order has one row per shipment, so keying it is cheap next to keying every visit
+    open_order = cleaned_open_order.assign(**{'Shipment Key': shipment_keys(cleaned_open_order['Shipment ID'])})
+
+    # Merge datasets using a private in-memory DuckDB, so a merge never waits on the warehouse file
+    with profile_stage("merge: duckdb join", cleaned_open_order) as stage, duckdb.connect(":memory:") as con:
+        con.register("open_order", open_order)
+        if isinstance(cleaned_trailer_activity, (str, os.PathLike)):
+            parts = os.path.join(cleaned_trailer_activity, "*.parquet").replace("'", "''")
+            con.execute(f"CREATE TEMP VIEW trailer_activity AS SELECT * FROM read_parquet('{parts}')")
+        else:
+            con.register("trailer_activity", cleaned_trailer_activity)
+        merged_df = stage(con.execute(query).fetchdf())
 
     # Set data types and calculate derived metrics
-    merged_df['Shipment ID'] = merged_df['Shipment ID'].astype(str).fillna("Unknown")
-    merged_df['SO Number'] = merged_df['SO Number'].astype(str)
+    with profile_stage("merge: coerce types", merged_df) as stage:
+        merged_df['Shipment ID'] = merged_df['Shipment ID'].astype(str).fillna("Unknown")
+        merged_df['SO Number'] = merged_df['SO Number'].astype(str)
 
-    datetime_columns = ['Appt DateTime', 'Checkin DateTime', 'Checkout DateTime', 'Required Time', 'Loaded DateTime']
-    for col in datetime_columns:
-        merged_df[col] = pd.to_datetime(merged_df[col], errors='coerce')
+        # DuckDB returns these as datetime64 already, so they are left as they are
+        datetime_columns = ['Appt DateTime', 'Checkin DateTime', 'Checkout DateTime', 'Required Time', 'Loaded DateTime']
+        for col in datetime_columns:
+            merged_df[col] = parse_datetime_column(merged_df[col])
 
-    merged_df['Carrier'] = merged_df['Carrier'].fillna("Unknown").astype(str)
-    merged_df['Visit Type'] = merged_df['Visit Type'].fillna("Unknown").astype(str)
-    merged_df['Compliance'] = merged_df['Compliance'].fillna("Unknown").astype(str)
+        merged_df['Carrier'] = merged_df['Carrier'].fillna("Unknown").astype(str)
+        merged_df['Visit Type'] = merged_df['Visit Type'].fillna("Unknown").astype(str)
+        merged_df['Compliance'] = merged_df['Compliance'].astype(object).fillna("Unknown").astype(str)
+        stage(merged_df)
 
     # Calculate dwell time
-    merged_df["Dwell Time"] = merged_df.apply(calculate_dwell_time, axis=1)
+    with profile_stage("merge: dwell time", merged_df) as stage:
+        merged_df["Dwell Time"] = compute_dwell_time(merged_df)
+        stage(merged_df)
 
     # Add Scheduled Date, Week, and Month columns
     merged_df['Scheduled Date'] = merged_df['Appt DateTime'].dt.date
@@ -183,39 +311,92 @@ def clean_and_merge_compliance(oo_df, ta_df):
     merged_df = merged_df[merged_df['Compliance'] != "Unknown"]
 
     # Remove duplicate Shipment ID rows, keeping the one with the latest Appt DateTime
-    merged_df = merged_df.sort_values(by='Appt DateTime', ascending=False).drop_duplicates(subset='Shipment ID')
+    with profile_stage("merge: dedup sort", merged_df) as stage:
+        merged_df = merged_df.sort_values(by='Appt DateTime', ascending=False).drop_duplicates(subset='Shipment Key')
+        merged_df = stage(merged_df.drop(columns='Shipment Key'))
 
     # Filter out specified carriers
-    carriers_to_exclude = [
-        'AACT', 'DIMS', 'EXLA', 'SAIA', 'FXFE', 'FXLA', 'FXNL', 'F106', 'F107',
-        'F109', 'F110', 'F111', 'F112', 'F117', 'ODFL', 'U743', 'U746', 'U748', 'VQXX', 'CTII'
-    ]
-    merged_df = merged_df[~merged_df['Carrier'].isin(carriers_to_exclude)]
+    merged_df = merged_df[~merged_df['Carrier'].isin(CARRIERS_TO_EXCLUDE)]
 
+    if not compact:
+        return merged_df
+    with profile_stage("merge: compact dtypes", merged_df) as stage:
+        return stage(compact_compliance(merged_df))
+
+def compact_compliance(merged_df):
+    """
+    Convert the merged compliance dataset to COMPLIANCE_DTYPES. Safe to apply more than once,
+    e.g. to frames read back from a store.
+    """
+    merged_df = merged_df.astype(COMPLIANCE_DTYPES)
+
+    # Categories are kept unordered, as astype('category') makes them
+    for col in ['Carrier', 'Visit Type']:
+        merged_df[col] = merged_df[col].cat.as_unordered()
     return merged_df
 
-def calculate_dwell_time(row):
+def uncompact_compliance(merged_df):
+    """
+    The merged compliance dataset in the loose dtypes merge_compliance(compact=False) returns:
+    object strings, float64 Dwell Time, date objects for Scheduled Date, UInt32 Week and int32
+    Month. Used to measure what compact_compliance saves on a frame that was merged compact.
     """
-    Calculate dwell time based on loaded, check-in, and appointment times.
+    merged_df = merged_df.copy()
+    for col in ['Appt DateTime', 'Checkin DateTime', 'Checkout DateTime', 'Required Time', 'Loaded DateTime']:
+        merged_df[col] = merged_df[col].astype('datetime64[ns]')
+    for col in ['Carrier', 'Visit Type', 'Compliance']:
+        merged_df[col] = merged_df[col].astype(str)
+    # Dwell hours have 2 decimals, so rounding undoes the float32 error
+    merged_df['Dwell Time'] = merged_df['Dwell Time'].astype('float64').round(2)
+    merged_df['Scheduled Date'] = pd.to_datetime(merged_df['Scheduled Date']).dt.date
+    merged_df['Week'] = merged_df['Week'].astype('UInt32')
+    merged_df['Month'] = merged_df['Month'].astype('int32')
+    return merged_df
+
+def compute_dwell_time(df):
+    """
+    Calculate dwell time in hours for every row based on loaded, check-in, and appointment times.
+    On Time loads are measured from the appointment, Late loads from check-in.
     """
-    loaded_datetime = row['Loaded DateTime']
-    checkin_datetime = row['Checkin DateTime']
-    appt_datetime = row['Appt DateTime']
-    compliance = row['Compliance']
+    loaded_datetime = parse_datetime_column(df['Loaded DateTime'])
+    checkin_datetime = parse_datetime_column(df['Checkin DateTime'])
+    appt_datetime = parse_datetime_column(df['Appt DateTime'])
+    compliance = df['Compliance']
 
     # Logic for dwell time
-    if pd.notna(loaded_datetime):
-        if compliance == 'On Time':
-            dwell_time = round((loaded_datetime - appt_datetime).total_seconds() / 3600, 2)
-        elif compliance == 'Late':
-            dwell_time = round((loaded_datetime - checkin_datetime).total_seconds() / 3600, 2)
-        else:
-            dwell_time = None
-    else:
-        dwell_time = None
+    on_time = (compliance == 'On Time').to_numpy(dtype=bool)
+    late = (compliance == 'Late').to_numpy(dtype=bool)
+    start_datetime = appt_datetime.where(on_time, checkin_datetime)
+    elapsed = pd.to_timedelta(loaded_datetime - start_datetime).astype('timedelta64[ns]')
+    dwell_time = dwell_hours(elapsed.to_numpy().astype(np.int64) // 1000)
+    dwell_time[elapsed.isna().to_numpy() | ~(on_time | late)] = np.nan
+
+    return pd.Series(dwell_time, index=df.index, dtype='float64')
+
+def dwell_hours(microseconds):
+    """
+    Convert elapsed microseconds to dwell hours rounded to 2 decimals and clamped at 0.
+    """
+    # Same arithmetic as Timedelta.total_seconds(), which truncates to microseconds
+    seconds = (microseconds // 10**6) + (microseconds % 10**6) / 1e6
+    dwell_time = _round_hours(seconds / 3600)
 
     # Ensure dwell time is valid and positive
-    if dwell_time is not None and dwell_time <= 0:
-        dwell_time = 0
+    dwell_time[dwell_time <= 0] = 0
+    return dwell_time
+
+def _round_hours(hours):
+    # np.round can disagree with round() when the value sits on a .xx5 boundary,
+    # so those few values go through round() to keep results identical
+    rounded = np.round(hours, 2)
+    scaled = hours * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[near_tie] = [round(float(value), 2) for value in hours[near_tie]]
+    return rounded
 
-    return dwell_time
\ No newline at end of file
+def calculate_dwell_time(row):
+    """
+    Calculate dwell time for a single row. Thin wrapper around compute_dwell_time.
+    """
+    dwell_time = compute_dwell_time(pd.DataFrame([row])).iloc[0]
+    return None if pd.isna(dwell_time) else float(dwell_time)
@@ -0,0 +1,126 @@
+import warnings
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.tseries.api import guess_datetime_format
+
+from src.utils.profiling import count_in_stage
+
+# Values looked at when detecting the timestamp format of a column
+FORMAT_SAMPLE_SIZE = 200
+MAX_FORMAT_GUESSES = 5
+# strptime directives Arrow does not handle like pandas: %f is unsupported, %z converts to UTC
+PANDAS_ONLY_DIRECTIVES = ("%f", "%z")
+
+_PANDAS_TIMESTAMP = pa.timestamp("ns")
+
+class TimestampParseWarning(UserWarning):
+    """
+    Some values of a timestamp column did not match its format and were set to NaT.
+    """
+
+def detect_timestamp_format(values, sample_size=FORMAT_SAMPLE_SIZE):
+    """
+    strptime format of a text timestamp column (pandas Series or Arrow array), detected once
+    from up to sample_size non-null values: the format guessed from the first value, unless
+    another value's format parses more of the sample. None when no value looks like a timestamp.
+    """
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        sample = pc.drop_null(values).slice(0, sample_size).to_pylist()
+    else:
+        sample = values[values.notna()].head(sample_size).tolist()
+    sample = pd.Series([str(value).strip() for value in sample], dtype=object)
+
+    # Guessing is slow, so formats are only guessed from values the best format so far misses
+    best_format, best_parsed = None, 0
+    unparsed = sample
+    for _ in range(MAX_FORMAT_GUESSES):
+        if unparsed.empty:
+            break
+        date_format = guess_datetime_format(unparsed.iloc[0])
+        unparsed = unparsed.iloc[1:]
+        if date_format is None:
+            continue
+        with warnings.catch_warnings():
+            # Values with mixed UTC offsets warn that pandas will stop parsing them
+            warnings.simplefilter("ignore", FutureWarning)
+            parsed = pd.to_datetime(sample, format=date_format, errors='coerce').notna()
+        if parsed.sum() > best_parsed:
+            best_format, best_parsed = date_format, parsed.sum()
+            unparsed = sample[~parsed]
+    return best_format
+
+def parse_datetime_column(values, date_format=None, name=None):
+    """
+    Parse a pandas text column to datetime64[ns] with an explicit format, by default the one
+    detected from a sample, using the Arrow parser (see parse_timestamps). Columns that are
+    already datetime64 are returned as they are.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    try:
+        text = pa.array(values, type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Numbers or other objects mixed into the column are parsed from their text
+        text = pa.array(values.where(values.isna(), values.astype(str)), type=pa.large_string(), from_pandas=True)
+    parsed = parse_timestamps(text, date_format, name=name or values.name)
+    return pd.Series(parsed.to_numpy(zero_copy_only=False), index=values.index, name=values.name).astype('datetime64[ns]')
+
+def parse_timestamps(values, date_format=None, name=None):
+    """
+    Parse an Arrow text column to timestamps with date_format, by default the format detected
+    from a sample. Values that do not match become null, like pd.to_datetime(errors='coerce');
+    their count is reported with a TimestampParseWarning and added to the running profile
+    stage as 'parse_failures'. Formats Arrow cannot parse (fractional seconds, UTC offsets)
+    go through pandas; UTC offsets are dropped, keeping each value's local clock time.
+    """
+    values = pc.utf8_trim_whitespace(values)
+    if date_format is None:
+        date_format = detect_timestamp_format(values)
+    if date_format is None or any(directive in date_format for directive in PANDAS_ONLY_DIRECTIVES):
+        parsed = _parse_with_pandas(values, date_format, name)
+    else:
+        parsed = pc.strptime(values, format=date_format, unit="ns", error_is_null=True)
+
+    # Blank cells are missing values, not failures
+    given = pc.and_kleene(pc.is_valid(values), pc.not_equal(values, ""))
+    failed = pc.sum(pc.and_kleene(given, pc.is_null(parsed))).as_py() or 0
+    if failed and failed == (pc.sum(given).as_py() or 0) and parsed.type != _PANDAS_TIMESTAMP:
+        # Arrow parsed nothing, e.g. a directive its strptime does not support: let pandas try
+        parsed = _parse_with_pandas(values, date_format, name)
+        failed = pc.sum(pc.and_kleene(given, pc.is_null(parsed))).as_py() or 0
+    report_parse_failures(name, failed)
+    return parsed
+
+def _parse_with_pandas(values, date_format, name):
+    # pd.to_datetime with the format (value by value without one), as an Arrow column like values
+    with warnings.catch_warnings():
+        # Mixed UTC offsets come back as datetime objects, with a FutureWarning
+        warnings.simplefilter("ignore", FutureWarning)
+        parsed = pd.to_datetime(values.to_pandas(), errors="coerce", format=date_format or "mixed")
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype) or parsed.dtype == object:
+        parsed = pd.to_datetime(parsed.map(_local_clock_time, na_action="ignore"))
+        warnings.warn(
+            f"UTC offsets in column '{name}' were dropped; its timestamps keep their local clock time.",
+            TimestampParseWarning,
+            stacklevel=4,
+        )
+    parsed = pa.array(parsed.astype("datetime64[ns]"), type=_PANDAS_TIMESTAMP)
+    return pa.chunked_array([parsed]) if isinstance(values, pa.ChunkedArray) else parsed
+
+def _local_clock_time(value):
+    return value.replace(tzinfo=None)
+
+def report_parse_failures(name, failed):
+    """
+    Warn about and count timestamp values of column name that could not be parsed.
+    """
+    if failed:
+        warnings.warn(
+            f"{failed:,} value(s) in column '{name}' could not be parsed as timestamps and were set to NaT.",
+            TimestampParseWarning,
+            stacklevel=3,
+        )
+        count_in_stage("parse_failures", failed)
@@ -0,0 +1,205 @@
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from duckdb.typing import BIGINT, DOUBLE
+
+from src.utils.cleaning_utils import (
+    CARRIERS_TO_EXCLUDE,
+    GRACE_PERIODS,
+    OPEN_ORDER_COLUMNS,
+    OPEN_ORDER_DATETIME_COLUMNS,
+    TRAILER_ACTIVITY_COLUMNS,
+    TRAILER_ACTIVITY_DATETIME_COLUMNS,
+    dwell_hours,
+)
+from src.utils.datetime_utils import PANDAS_ONLY_DIRECTIVES, detect_timestamp_format, parse_datetime_column
+from src.utils.shipment_ids import NUMERIC_ID_PATTERN
+
+QUERY = """
+WITH open_order AS (
+    SELECT
+        {oo_shipment_id} AS shipment_id,
+        COALESCE(trim(CAST({oo_so} AS VARCHAR)), 'nan') AS so_number,
+        {oo_appt} AS appt,
+        {oo_ordinal} AS ordinal,
+        {oo_status} AS order_status
+    FROM raw_open_order
+),
+shipped AS (
+    SELECT
+        {shipment_key} AS shipment_key,
+        shipment_id AS "Shipment ID",
+        string_agg(DISTINCT so_number, ', ' ORDER BY so_number) AS "SO Number",
+        arg_min(appt, ordinal) AS "Appt DateTime"
+    FROM open_order
+    WHERE appt IS NOT NULL
+      AND lower(trim(CAST(order_status AS VARCHAR))) = 'shipped'
+    GROUP BY shipment_id
+),
+trailer_activity AS (
+    SELECT
+        {ta_shipment_key} AS shipment_key,
+        {ta_checkin} AS "Checkin DateTime",
+        {ta_appt} AS appointment,
+        {ta_checkout} AS "Checkout DateTime",
+        {ta_loaded} AS "Loaded DateTime",
+        {ta_carrier} AS "Carrier",
+        {ta_visit_type} AS "Visit Type"
+    FROM raw_trailer_activity
+    WHERE {ta_activity_type} = 'CLOSED'
+      AND {ta_visit_type} IN ('Pickup Load', 'Live Load')
+),
+compliance AS (
+    SELECT
+        *,
+        appointment + CASE WHEN "Visit Type" = 'Live Load'
+            THEN INTERVAL '{live_load_seconds} seconds'
+            ELSE INTERVAL '{pickup_load_seconds} seconds' END AS "Required Time"
+    FROM trailer_activity
+    WHERE appointment IS NOT NULL
+      AND "Checkin DateTime" IS NOT NULL
+      AND "Checkout DateTime" IS NOT NULL
+),
+merged AS (
+    SELECT
+        shipped."Shipment ID",
+        shipped."SO Number",
+        shipped."Appt DateTime",
+        compliance."Checkin DateTime",
+        compliance."Checkout DateTime",
+        compliance."Required Time",
+        compliance."Loaded DateTime",
+        COALESCE(compliance."Carrier", 'Unknown') AS "Carrier",
+        COALESCE(compliance."Visit Type", 'Unknown') AS "Visit Type",
+        CASE WHEN compliance."Checkin DateTime" <= compliance."Required Time"
+            THEN 'On Time' ELSE 'Late' END AS "Compliance"
+    FROM shipped
+    LEFT JOIN compliance
+    ON shipped.shipment_key = compliance.shipment_key
+    WHERE compliance.shipment_key IS NOT NULL
+    QUALIFY row_number() OVER (PARTITION BY shipped.shipment_key ORDER BY shipped."Appt DateTime" DESC) = 1
+)
+SELECT
+    *,
+    CAST(dwell_hours(
+        epoch_us("Loaded DateTime")
+        - epoch_us(CASE WHEN "Compliance" = 'On Time' THEN "Appt DateTime" ELSE "Checkin DateTime" END)
+    ) AS FLOAT) AS "Dwell Time",
+    CAST(date_trunc('day', "Appt DateTime") AS TIMESTAMP_NS) AS "Scheduled Date",
+    CAST(weekofyear("Appt DateTime") AS UTINYINT) AS "Week",
+    CAST(month("Appt DateTime") AS UTINYINT) AS "Month"
+FROM merged
+WHERE "Carrier" NOT IN ({carriers_to_exclude})
+ORDER BY "Appt DateTime" DESC
+"""
+
+def clean_and_merge_compliance_duckdb(oo_df, ta_df):
+    """
+    Clean Open Order and Trailer Activity and merge them in a single DuckDB query.
+    Same rules as the pandas engine in clean_and_merge_compliance, returned as an Arrow table
+    with the compact numeric and date types; compact_compliance completes the schema after to_pandas().
+    """
+    oo_columns = _resolve_columns(oo_df, OPEN_ORDER_COLUMNS, "Open Order")
+    ta_columns = _resolve_columns(ta_df, TRAILER_ACTIVITY_COLUMNS, "Trailer Activity")
+    oo_df = _parse_pandas_only_datetimes(oo_df, [oo_columns[col] for col in OPEN_ORDER_DATETIME_COLUMNS])
+    oo_df, oo_ordinal = _with_row_ordinal(oo_df)
+    ta_df = _parse_pandas_only_datetimes(ta_df, [ta_columns[col] for col in TRAILER_ACTIVITY_DATETIME_COLUMNS])
+
+    query = QUERY.format(
+        oo_shipment_id=_shipment_id_sql(oo_columns['Shipment Nbr']),
+        oo_so=oo_columns['SO #'],
+        oo_appt=_datetime_sql(oo_df, oo_columns['Appt Date and Time']),
+        oo_status=oo_columns['Order Status'],
+        oo_ordinal=oo_ordinal,
+        shipment_key=_shipment_key_sql("shipment_id"),
+        ta_shipment_key=_shipment_key_sql(_shipment_id_sql(ta_columns['SHIPMENT_ID'])),
+        ta_checkin=_datetime_sql(ta_df, ta_columns['CHECKIN DATE TIME']),
+        ta_appt=_datetime_sql(ta_df, ta_columns['APPOINTMENT DATE TIME']),
+        ta_checkout=_datetime_sql(ta_df, ta_columns['CHECKOUT DATE TIME']),
+        ta_loaded=_datetime_sql(ta_df, ta_columns['Date/Time']),
+        ta_carrier=ta_columns['CARRIER'],
+        ta_visit_type=ta_columns['VISIT TYPE'],
+        ta_activity_type=ta_columns['ACTIVITY TYPE'],
+        live_load_seconds=int(GRACE_PERIODS['Live Load'].total_seconds()),
+        pickup_load_seconds=int(GRACE_PERIODS['Pickup Load'].total_seconds()),
+        carriers_to_exclude=", ".join(_quote_literal(carrier) for carrier in CARRIERS_TO_EXCLUDE),
+    )
+
+    # A private in-memory database per call; the warehouse file is only for persisted datasets
+    with duckdb.connect(":memory:") as con:
+        con.create_function("dwell_hours", _dwell_hours_udf, [BIGINT], DOUBLE, type="arrow")
+        con.register("raw_open_order", oo_df)
+        con.register("raw_trailer_activity", ta_df)
+        return con.execute(query).arrow()
+
+def _dwell_hours_udf(microseconds):
+    # Vectorized UDF: reuse the pandas engine's rounding so both engines agree exactly
+    microseconds = pa.chunked_array([microseconds]) if isinstance(microseconds, pa.Array) else microseconds
+    values = pc.fill_null(microseconds, 0).to_numpy()
+    return pa.array(dwell_hours(values), mask=microseconds.is_null().to_numpy(), type=pa.float64())
+
+def _resolve_columns(df, required, report_name):
+    # Map stripped header names to the quoted raw header names
+    available = {str(col).strip(): col for col in df.columns}
+    missing = [col for col in required if col not in available]
+    if missing:
+        raise KeyError(f"{missing} column(s) missing in the {report_name} CSV.")
+    return {col: _quote_identifier(available[col]) for col in required}
+
+def _shipment_id_sql(column):
+    return f"COALESCE(regexp_extract(replace(CAST({column} AS VARCHAR), ',', ''), '(\\d+)', 1), '')"
+
+def _shipment_key_sql(shipment_id):
+    # int64 key as in shipment_ids.shipment_keys; other IDs get a negative hash, which only has
+    # to agree within this query
+    return (
+        f"CASE WHEN regexp_full_match({shipment_id}, {_quote_literal(NUMERIC_ID_PATTERN[1:-1])}) "
+        f"THEN CAST({shipment_id} AS BIGINT) "
+        f"ELSE -1 - CAST(hash({shipment_id}) >> 1 AS BIGINT) END"
+    )
+
+def _parse_pandas_only_datetimes(df, columns):
+    # DuckDB reads %f as a count of microseconds ('.5' -> 5 us) and converts %z to UTC, so those
+    # columns are parsed like the pandas engine before the query sees them
+    parsed = {}
+    for column in columns:
+        values = df[_unquote_identifier(column)]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            continue
+        date_format = detect_timestamp_format(values)
+        if date_format is not None and any(directive in date_format for directive in PANDAS_ONLY_DIRECTIVES):
+            parsed[values.name] = parse_datetime_column(values, date_format)
+    return df.assign(**parsed) if parsed else df
+
+def _with_row_ordinal(df):
+    # The first appointment of a shipment is the one in the earliest row, as in the pandas engine.
+    # row_number() OVER () follows scan order, which a parallel scan does not keep, so the row
+    # position is passed in as a column instead (on a shallow copy; df itself is left alone).
+    name = "ordinal"
+    while name in df.columns:
+        name = "_" + name
+    df = df.copy(deep=False)
+    df[name] = np.arange(len(df), dtype=np.int64)
+    return df, _quote_identifier(name)
+
+def _datetime_sql(df, column):
+    # Parse with the format detected from a sample of the column
+    values = df[_unquote_identifier(column)]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return f"CAST({column} AS TIMESTAMP)"
+
+    date_format = detect_timestamp_format(values)
+    if date_format is None:
+        return f"TRY_CAST(trim(CAST({column} AS VARCHAR)) AS TIMESTAMP)"
+    return f"try_strptime(trim(CAST({column} AS VARCHAR)), {_quote_literal(date_format)})"
+
+def _quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _unquote_identifier(identifier):
+    return identifier[1:-1].replace('""', '"')
+
+def _quote_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
@@ -0,0 +1,142 @@
+import hashlib
+import io
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from src.utils.cleaning_utils import (
+    OPEN_DOCK_COLUMNS,
+    OPEN_DOCK_DATETIME_COLUMNS,
+    OPEN_ORDER_COLUMNS,
+    OPEN_ORDER_DATETIME_COLUMNS,
+    TRAILER_ACTIVITY_COLUMNS,
+    TRAILER_ACTIVITY_DATETIME_COLUMNS,
+)
+from src.utils.datetime_utils import detect_timestamp_format, parse_timestamps
+from src.utils.profiling import profile_stage
+
+# Columns the cleaners need from each report. Open Dock headers are matched case-insensitively
+# because clean_open_dock_no_shows lowercases them.
+REPORT_SCHEMAS = {
+    "open_dock": {
+        "columns": OPEN_DOCK_COLUMNS,
+        "datetime_columns": OPEN_DOCK_DATETIME_COLUMNS,
+        "case_sensitive": False,
+    },
+    "open_order": {
+        "columns": OPEN_ORDER_COLUMNS,
+        "datetime_columns": OPEN_ORDER_DATETIME_COLUMNS,
+        "case_sensitive": True,
+    },
+    "trailer_activity": {
+        "columns": TRAILER_ACTIVITY_COLUMNS,
+        "datetime_columns": TRAILER_ACTIVITY_DATETIME_COLUMNS,
+        "case_sensitive": True,
+    },
+}
+
+def read_report(file, report_type):
+    """
+    Read an uploaded report CSV with the multi-threaded Arrow reader.
+    Only the columns the cleaners need are kept and timestamp columns are parsed on read.
+    """
+    table = read_report_arrow(file, report_type)
+    with profile_stage(f"{report_type}: to pandas", table.num_rows) as stage:
+        return stage(table.to_pandas())
+
+def read_report_arrow(file, report_type):
+    """
+    Read an uploaded report CSV into an Arrow table. See read_report.
+    """
+    with profile_stage(f"{report_type}: parse csv") as stage:
+        source, convert_options, datetime_columns = _csv_options(file, report_type)
+        table = stage(pa_csv.read_csv(source, convert_options=convert_options))
+
+    with profile_stage(f"{report_type}: parse timestamps", table.num_rows) as stage:
+        for col in datetime_columns:
+            index = table.schema.get_field_index(col)
+            table = table.set_column(index, col, parse_timestamps(table[col], name=col))
+        stage(table.num_rows)
+
+    return table
+
+def iter_report_batches(file, report_type, block_size):
+    """
+    Stream a report CSV as Arrow record batches of about block_size bytes, projected and
+    parsed like read_report_arrow. Each timestamp column keeps the format detected from its
+    first batch, so later batches parse with the same format.
+    """
+    source, convert_options, datetime_columns = _csv_options(file, report_type)
+    reader = pa_csv.open_csv(source, read_options=pa_csv.ReadOptions(block_size=block_size), convert_options=convert_options)
+
+    formats = {}
+    for batch in reader:
+        columns = []
+        for name, values in zip(batch.schema.names, batch.columns):
+            if name in datetime_columns:
+                if formats.get(name) is None:
+                    formats[name] = detect_timestamp_format(values)
+                values = parse_timestamps(values, formats[name], name=name)
+            columns.append(values)
+        yield pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+def file_digest(file):
+    """
+    SHA-256 hex digest of an uploaded file's raw bytes.
+    """
+    source = _as_binary(file)
+    digest = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+        source.seek(0)
+    return digest.hexdigest()
+
+def _as_binary(file):
+    # Streamlit uploads are file-like; paths and raw bytes are accepted too
+    if isinstance(file, (bytes, bytearray)):
+        return io.BytesIO(file)
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return file
+
+def _csv_options(file, report_type):
+    # Binary source, Arrow convert options and matched timestamp columns for a report
+    if report_type not in REPORT_SCHEMAS:
+        raise ValueError(f"Unknown report type '{report_type}'. Expected one of {list(REPORT_SCHEMAS)}.")
+    schema = REPORT_SCHEMAS[report_type]
+
+    source = _as_binary(file)
+    header = _read_header(source)
+    columns = _match_columns(header, schema["columns"], schema["case_sensitive"])
+    datetime_columns = _match_columns(header, schema["datetime_columns"], schema["case_sensitive"])
+
+    # Read every projected column as text; pd.read_csv would have inferred object for them anyway.
+    # Fall back to all columns if none match so the cleaners can report what is missing.
+    # Empty fields read as null (None after to_pandas) where pd.read_csv gives NaN; the cleaners
+    # treat both as missing, e.g. a missing 'SO #' becomes 'nan' either way.
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=columns or None,
+        column_types={col: pa.string() for col in (columns or header)},
+        strings_can_be_null=True,
+    )
+    return source, convert_options, datetime_columns
+
+def _read_header(source):
+    # Column names as the Arrow reader sees them, so a BOM and quoted names holding commas or
+    # newlines are handled like in the read itself; only the first block is parsed
+    reader = pa_csv.open_csv(source)
+    header = reader.schema.names
+    reader.close()
+    if not isinstance(source, str):
+        source.seek(0)
+    return header
+
+def _match_columns(header, wanted, case_sensitive):
+    # Return the raw header names whose stripped (and optionally lowercased) form is wanted
+    normalize = (lambda name: name.strip()) if case_sensitive else (lambda name: name.strip().lower())
+    return [name for name in header if normalize(name) in wanted]
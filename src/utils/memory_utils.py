@@ -0,0 +1,54 @@
+import pandas as pd
+import pyarrow as pa
+
+# Arrow text columns are viewed as pandas' Arrow-backed strings rather than copied into objects
+_TEXT_VIEW_DTYPES = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}
+
+def memory_report(before, after):
+    """
+    Dtype and bytes per column of two versions of a DataFrame (e.g. before and after
+    compact_compliance), with a 'Total' row. Object columns are measured deeply.
+    """
+    before_bytes = before.memory_usage(index=False, deep=True)
+    after_bytes = after.memory_usage(index=False, deep=True).reindex(before_bytes.index)
+    report = pd.DataFrame({
+        'Column': before_bytes.index,
+        'Dtype Before': before.dtypes.astype(str).reindex(before_bytes.index).to_numpy(),
+        'Dtype After': after.dtypes.astype(str).reindex(before_bytes.index).to_numpy(),
+        'Bytes Before': before_bytes.to_numpy(),
+        'Bytes After': after_bytes.to_numpy(),
+    })
+    total = pd.DataFrame([{
+        'Column': 'Total',
+        'Dtype Before': '',
+        'Dtype After': '',
+        'Bytes Before': before_bytes.sum(),
+        'Bytes After': after_bytes.sum(),
+    }])
+    report = pd.concat([report, total], ignore_index=True)
+    report['Saved %'] = (100 * (1 - report['Bytes After'] / report['Bytes Before'])).round(1)
+    return report
+
+def format_memory_report(report):
+    """
+    Render a memory_report as a plain-text table.
+    """
+    return report.to_string(index=False, formatters={
+        'Bytes Before': '{:,}'.format,
+        'Bytes After': '{:,}'.format,
+    })
+
+def freeze_frame(df):
+    """
+    Immutable Arrow copy of a DataFrame, index included, to share as one copy (e.g. across
+    the pages of a session) and read through frame_view.
+    """
+    return pa.Table.from_pandas(df)
+
+def frame_view(table):
+    """
+    DataFrame over an Arrow table from freeze_frame without copying the data where it can:
+    text columns are Arrow-backed strings, numbers and timestamps without nulls are read-only
+    NumPy arrays over the Arrow buffers. Writing to a value raises; new columns only change the view.
+    """
+    return table.to_pandas(split_blocks=True, types_mapper=_TEXT_VIEW_DTYPES.get)
@@ -0,0 +1,78 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.config.settings import CLEANING_WORKERS, PARALLEL_MIN_ROWS
+from src.utils.cleaning_utils import (
+    clean_open_dock_no_shows,
+    clean_open_order,
+    clean_trailer_activity,
+    merge_compliance,
+)
+from src.utils.profiling import extend_profile, is_profiling, profiles_memory, run_profiled
+
+# One pool shared by every run and session; see _get_executor
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+def clean_reports(od_df, oo_df, ta_df, max_workers=CLEANING_WORKERS, min_rows=PARALLEL_MIN_ROWS):
+    """
+    Clean the three reports concurrently and merge compliance. Returns (no_show_data, merged_df).
+    The largest report is cleaned in the calling process so its frame is never pickled; the other
+    two run on a shared pool of up to max_workers processes. Inputs with fewer than min_rows rows in total,
+    or max_workers below 1, are cleaned serially since starting the pool would cost more than it saves.
+    """
+    jobs = [(clean_open_dock_no_shows, od_df), (clean_open_order, oo_df), (clean_trailer_activity, ta_df)]
+    if max_workers < 1 or sum(len(df) for _, df in jobs) < min_rows:
+        no_show_data, cleaned_open_order, cleaned_trailer_activity = [cleaner(df) for cleaner, df in jobs]
+        return no_show_data, merge_compliance(cleaned_open_order, cleaned_trailer_activity)
+
+    local = max(range(len(jobs)), key=lambda i: len(jobs[i][1]))
+    remote = [i for i in range(len(jobs)) if i != local]
+    results = [None] * len(jobs)
+    profile = is_profiling()
+    executor = _get_executor(min(max_workers, len(remote)))
+    if profile:
+        # Workers profile their cleaner and send the stage records back with the result
+        futures = {i: executor.submit(run_profiled, *jobs[i], memory=profiles_memory()) for i in remote}
+    else:
+        futures = {i: executor.submit(*jobs[i]) for i in remote}
+    cleaner, df = jobs[local]
+    results[local] = cleaner(df)
+    for i, future in futures.items():
+        try:
+            results[i] = future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool on the next run
+            _discard_executor(executor)
+            raise
+        if profile:
+            results[i], records = results[i]
+            extend_profile(records)
+
+    no_show_data, cleaned_open_order, cleaned_trailer_activity = results
+    return no_show_data, merge_compliance(cleaned_open_order, cleaned_trailer_activity)
+
+def _get_executor(max_workers):
+    """
+    The shared process pool, created on first use and recreated only when max_workers changes.
+    Workers are spawned rather than forked: forking the multithreaded Streamlit server can copy
+    a lock held by another thread into the child and deadlock it.
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            _executor_workers = max_workers
+        return _executor
+
+def _discard_executor(executor):
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
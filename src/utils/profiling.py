@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from contextvars import ContextVar
+from datetime import datetime
+
+from src.config.settings import LOGS_PATH
+
+PROFILE_LOG_FILE = "pipeline_profile.log"
+
+# Profile of the current thread's pipeline run, or None when nothing is being profiled
+_active_profile = ContextVar("active_profile", default=None)
+
+@contextmanager
+def profiling(memory=False):
+    """
+    Record every profile_stage run inside the block. Yields the list of stage records in the
+    order the stages started; depth counts the stages that enclose each one. With memory=True,
+    peak memory is measured with tracemalloc, which slows pandas string work down a few times.
+    """
+    records = []
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _active_profile.set({"records": records, "memory": memory, "stack": []})
+    try:
+        yield records
+    finally:
+        _active_profile.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+def is_profiling():
+    """
+    True inside a profiling() block.
+    """
+    return _active_profile.get() is not None
+
+def profiles_memory():
+    """
+    True inside a profiling(memory=True) block.
+    """
+    profile = _active_profile.get()
+    return profile is not None and profile["memory"]
+
+@contextmanager
+def profile_stage(name, rows_in=None):
+    """
+    Time one pipeline stage. rows_in is the stage's input frame or a row count; calling the
+    yielded function with the output frame (or a count) records rows out and returns it.
+    Does nothing but pass values through outside a profiling() block.
+    """
+    profile = _active_profile.get()
+    rows = {"rows_in": _rows(rows_in), "rows_out": None}
+    def record(result):
+        rows["rows_out"] = _rows(result)
+        return result
+
+    if profile is None:
+        yield record
+        return
+
+    stack = profile["stack"]
+    entry = {"stage": name, "depth": len(stack)}
+    profile["records"].append(entry)
+    frame = {"start": 0, "peak": 0, "entry": entry}
+    if profile["memory"]:
+        # Hand the peak so far to the enclosing stages before restarting it for this one
+        current, peak = tracemalloc.get_traced_memory()
+        for parent in stack:
+            parent["peak"] = max(parent["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current, "entry": entry}
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        peak_memory = None
+        if profile["memory"]:
+            frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+            peak_memory = frame["peak"] - frame["start"]
+        entry.update(seconds=round(seconds, 6), **rows, peak_memory_bytes=peak_memory)
+
+def count_in_stage(counter, n):
+    """
+    Add n to a counter (e.g. 'parse_failures') of the innermost running stage, if any.
+    """
+    profile = _active_profile.get()
+    if profile is not None and profile["stack"]:
+        entry = profile["stack"][-1]["entry"]
+        entry[counter] = entry.get(counter, 0) + n
+
+def profiled(name):
+    """
+    Decorator that runs a pipeline function as one profile_stage, with rows in taken from
+    its first argument and rows out from its result.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            rows_in = args[0] if args and hasattr(args[0], "__len__") else None
+            with profile_stage(name, rows_in) as stage:
+                return stage(func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+def extend_profile(records):
+    """
+    Add stage records made elsewhere, e.g. in a worker process, to the active profile.
+    """
+    profile = _active_profile.get()
+    if profile is not None:
+        depth = len(profile["stack"])
+        profile["records"].extend({**record, "depth": record["depth"] + depth} for record in records)
+
+def run_profiled(func, *args, memory=False):
+    """
+    Call func(*args) under its own profiling() block. Returns (result, stage records);
+    used to bring the stages of work done in another process back to the caller.
+    """
+    with profiling(memory=memory) as records:
+        result = func(*args)
+    return result, records
+
+def log_profile(records, logs_dir=LOGS_PATH, **context):
+    """
+    Append one JSON line per stage record to the pipeline profile log under logs_dir. Every
+    line of a run shares a run_id and timestamp, plus any context given (e.g. the cache key).
+    """
+    os.makedirs(logs_dir, exist_ok=True)
+    run = {"run_id": uuid.uuid4().hex, "time": datetime.now().isoformat(timespec="seconds"), **context}
+    logger = _profile_logger(os.path.join(logs_dir, PROFILE_LOG_FILE))
+    for record in records:
+        logger.info(json.dumps({**run, **record}))
+
+def _profile_logger(path):
+    # One logger per log file, writing bare JSON lines
+    logger = logging.getLogger(f"{__name__}.{os.path.abspath(path)}")
+    if not logger.handlers:
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def _rows(value):
+    if value is None or isinstance(value, int):
+        return value
+    return len(value) if hasattr(value, "__len__") else None
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Digit strings that round-trip through int64: no leading zero and at most 18 digits
+NUMERIC_ID_PATTERN = r"^(0|[1-9][0-9]{0,17})$"
+
+def normalize_shipment_ids(values):
+    """
+    Normalized Shipment IDs of a raw column: the first run of digits once thousands separators
+    are removed ('SHP-1,234' -> '1234'), or '' when there is none. Same result as
+    .astype(str).str.replace(',', '').str.extract(r'(\\d+)').fillna(''), computed with Arrow.
+    """
+    digits = _extract_digits(values)
+    return pd.Series(digits.to_numpy(zero_copy_only=False), index=values.index, name=values.name, dtype=object)
+
+def shipment_keys(values, return_side_table=False):
+    """
+    int64 join key of each Shipment ID in values (raw or already normalized). IDs that are a
+    plain number are keyed by that number; the few others (no digits, leading zeros, more than
+    18 digits) get a negative key hashed from the normalized ID, the same in every process.
+    With return_side_table=True, also returns a Series of those normalized IDs indexed by key.
+    """
+    digits = _extract_digits(values)
+    numeric = pc.match_substring_regex(digits, NUMERIC_ID_PATTERN).to_numpy(zero_copy_only=False)
+    keys = pc.cast(pc.if_else(numeric, digits, "0"), pa.int64()).to_numpy(zero_copy_only=False).copy()
+
+    others = pd.Series(pc.filter(digits, pc.invert(numeric)).to_numpy(zero_copy_only=False), dtype=object)
+    other_keys = _hashed_keys(others.to_numpy())
+    keys[~numeric] = other_keys
+    keys = pd.Series(keys, index=values.index, name=values.name)
+    if not return_side_table:
+        return keys
+
+    side_table = pd.Series(others.to_numpy(), index=pd.Index(other_keys, name="Shipment Key"), name="Shipment ID")
+    return keys, side_table[~side_table.index.duplicated()]
+
+def shipment_ids_from_keys(keys, side_table):
+    """
+    Normalized Shipment IDs back from shipment_keys: numbers for non-negative keys, the side
+    table for the others.
+    """
+    keys = pd.Series(keys)
+    ids = keys.astype(str).astype(object)
+    hashed = keys < 0
+    ids[hashed] = side_table.reindex(keys[hashed]).to_numpy()
+    return ids
+
+def _extract_digits(values):
+    try:
+        text = pa.array(values, type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Numbers and other objects are matched in their text, like astype(str)
+        text = pa.array(values.astype(str).to_numpy(dtype=object), type=pa.large_string())
+    matched = pc.extract_regex(pc.replace_substring(text, ",", ""), r"(?P<id>\d+)")
+    return pc.fill_null(pc.struct_field(matched, "id"), "")
+
+def _hashed_keys(ids):
+    # Negative keys, so they can never collide with a numeric ID
+    hashes = pd.util.hash_array(np.asarray(ids, dtype=object), categorize=False)
+    return -1 - (hashes >> np.uint64(1)).astype(np.int64)
@@ -0,0 +1,240 @@
+import glob
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.config.settings import SHIPMENT_STORE_PATH
+from src.utils.cleaning_utils import (
+    CLEANING_VERSION,
+    clean_open_order_rows,
+    compact_compliance,
+    clean_trailer_activity,
+    combine_open_order_rows,
+    merge_compliance,
+)
+from src.utils.shipment_ids import shipment_keys
+from src.utils.streaming_pipeline import CLEANED_TRAILER_ACTIVITY_SCHEMA
+
+# Cleaned Open Order rows are stored before they are combined per shipment,
+# so SO Numbers and the first appointment can be recombined across deltas.
+# Shipments are looked up by the same int64 key on both sides.
+OPEN_ORDER_ROWS_SCHEMA = pa.schema([
+    ("Shipment Key", pa.int64()),
+    ("Shipment Nbr", pa.string()),
+    ("Appt Date and Time", pa.timestamp("ns")),
+    ("SO #", pa.string()),
+])
+
+# Layout of the store's files; stores written with another layout have to be rebuilt
+STORE_LAYOUT = 3
+MANIFEST_FILE = "manifest.json"
+# Merged compliance rows are appended per delta, next to the Shipment Keys each delta touched.
+# A shipment's row is the one in the latest part holding it, unless a later delta touched it
+# and dropped it. Parts are folded into one once there are this many.
+COMPACT_AFTER_PARTS = 32
+# Parts are sorted by Shipment Key, so an ingest only reads row groups whose key range can hold
+# an affected shipment
+ROW_GROUP_SIZE = 64 * 1024
+TOUCHED_SCHEMA = pa.schema([("Shipment Key", pa.int64())])
+
+def ingest_reports(oo_df, ta_df, store_dir=SHIPMENT_STORE_PATH, delta_id=None, no_show_data=None, no_show_id=None):
+    """
+    Add a delta of raw Open Order and Trailer Activity rows to the shipment store and upsert
+    the merged compliance rows of every Shipment ID the delta touches. No Show data cleaned
+    from the Open Dock upload of the same day is stored as its own part, see load_no_shows;
+    it is skipped only when no_show_id was already stored, not when the delta was.
+
+    The cleaned rows of each delta are appended as new Parquet parts; only affected shipments
+    are merged again, from all of their stored rows, so the result matches cleaning the full
+    history at once. Only the stored row groups that can hold an affected shipment are read,
+    and the upserted rows are appended as a new compliance part, so the cost follows the size
+    of the delta rather than of the store. A delta_id that was already ingested is skipped.
+    Returns the number of affected Shipment IDs.
+    """
+    manifest = _read_manifest(store_dir)
+    # A new Open Dock file can come with Open Order and Trailer Activity files already ingested
+    added_no_shows = no_show_data is not None and _add_no_shows(manifest, store_dir, no_show_data, no_show_id)
+    if delta_id is not None and delta_id in manifest["deltas"]:
+        if added_no_shows:
+            _write_manifest(store_dir, manifest)
+        return 0
+
+    oo_rows = clean_open_order_rows(oo_df)
+    oo_rows = oo_rows.assign(**{'Shipment Key': shipment_keys(oo_rows['Shipment Nbr'])})[OPEN_ORDER_ROWS_SCHEMA.names]
+    ta_rows = clean_trailer_activity(ta_df)
+    affected = np.union1d(oo_rows['Shipment Key'].to_numpy(), ta_rows['Shipment Key'].to_numpy()).astype(np.int64)
+
+    # Append the delta; a part left by an interrupted ingest is overwritten by the next one
+    part = len(manifest["deltas"])
+    _write_part(oo_rows, os.path.join(store_dir, "open_order"), part, OPEN_ORDER_ROWS_SCHEMA)
+    _write_part(ta_rows, os.path.join(store_dir, "trailer_activity"), part, CLEANED_TRAILER_ACTIVITY_SCHEMA)
+
+    # Merge affected shipments from all of their stored rows, in ingestion order
+    oo_affected = _read_rows(os.path.join(store_dir, "open_order"), OPEN_ORDER_ROWS_SCHEMA, affected, part)
+    ta_affected = _read_rows(os.path.join(store_dir, "trailer_activity"), CLEANED_TRAILER_ACTIVITY_SCHEMA, affected, part)
+    upserted = merge_compliance(combine_open_order_rows(oo_affected), ta_affected)
+    upserted['Shipment Key'] = shipment_keys(upserted['Shipment ID'])
+    _write_part(upserted, os.path.join(store_dir, "compliance"), part)
+    _write_part(pd.DataFrame({'Shipment Key': affected}), os.path.join(store_dir, "touched"), part, TOUCHED_SCHEMA)
+
+    manifest["deltas"].append(delta_id)
+    _write_manifest(store_dir, manifest)
+
+    if len(_part_paths(os.path.join(store_dir, "compliance"), part)) > COMPACT_AFTER_PARTS:
+        _compact_compliance_parts(store_dir, part)
+    return len(affected)
+
+def load_compliance(store_dir=SHIPMENT_STORE_PATH):
+    """
+    The merged dwell and compliance dataset held by the store, or None if nothing was ingested.
+    """
+    if not os.path.isfile(os.path.join(store_dir, MANIFEST_FILE)):
+        return None
+    deltas = len(_read_manifest(store_dir)["deltas"])
+    if deltas == 0:
+        return None
+    compliance = _live_compliance(store_dir, deltas - 1).drop(columns='Shipment Key')
+    return compact_compliance(compliance.sort_values(by='Appt DateTime', ascending=False, kind='stable').reset_index(drop=True))
+
+def load_no_shows(store_dir=SHIPMENT_STORE_PATH):
+    """
+    The No Show data of every Open Dock upload in the store, or None if none was ingested.
+    Open Dock exports overlap, so a newer upload replaces the stored No Shows on the days
+    its own No Shows span.
+    """
+    if not os.path.isfile(os.path.join(store_dir, MANIFEST_FILE)):
+        return None
+    manifest = _read_manifest(store_dir)
+    paths = _part_paths(os.path.join(store_dir, "no_shows"), len(manifest["no_show_uploads"]) - 1)
+    if not paths:
+        return None
+
+    frames = []
+    later_days = []
+    for part, path in reversed(paths.items()):
+        no_shows = pd.read_parquet(path)
+        day = no_shows['appointment datetime'].dt.normalize()
+        covered = np.zeros(len(no_shows), dtype=bool)
+        for first, last in later_days:
+            covered |= ((day >= first) & (day <= last)).to_numpy()
+        frames.append(no_shows[~covered])
+        if part_days := manifest["no_show_days"].get(str(part)):
+            later_days.append(tuple(pd.Timestamp(day) for day in part_days))
+    no_shows = pd.concat(frames[::-1])
+    return no_shows.sort_values(by='appointment datetime', ascending=False, kind='stable').reset_index(drop=True)
+
+def _add_no_shows(manifest, store_dir, no_shows, no_show_id):
+    # Store an Open Dock upload's No Shows as the next part, with the first and last day they
+    # span (None when there are none). Returns False if no_show_id was stored before.
+    if no_show_id is not None and no_show_id in manifest["no_show_uploads"]:
+        return False
+    part = len(manifest["no_show_uploads"])
+    table_dir = os.path.join(store_dir, "no_shows")
+    os.makedirs(table_dir, exist_ok=True)
+    _write_atomic(pa.Table.from_pandas(no_shows, preserve_index=False), os.path.join(table_dir, f"part-{part:06d}.parquet"))
+    days = no_shows['appointment datetime'].dt.normalize()
+    manifest["no_show_days"][str(part)] = None if no_shows.empty else [days.min().isoformat(), days.max().isoformat()]
+    manifest["no_show_uploads"].append(no_show_id)
+    return True
+
+def _live_compliance(store_dir, last_part):
+    # Latest row of each shipment, dropping shipments a later delta touched without merging them again
+    paths = _part_paths(os.path.join(store_dir, "compliance"), last_part)
+    compliance = pd.concat(
+        [pd.read_parquet(path).assign(part=part) for part, path in paths.items()], ignore_index=True
+    ).drop_duplicates(subset='Shipment Key', keep='last')
+
+    touched_paths = _part_paths(os.path.join(store_dir, "touched"), last_part)
+    touched = pd.concat([TOUCHED_SCHEMA.empty_table().to_pandas().assign(part=-1)] + [
+        pd.read_parquet(path).assign(part=part) for part, path in touched_paths.items()
+    ], ignore_index=True)
+    last_touched = touched.groupby('Shipment Key')['part'].max()
+    dropped = compliance['Shipment Key'].map(last_touched).fillna(-1).to_numpy() > compliance['part'].to_numpy()
+    return compliance[~dropped].drop(columns='part')
+
+def _compact_compliance_parts(store_dir, last_part):
+    # Fold every compliance part into the last one. Older files are only removed once it is in
+    # place, and the latest part wins for each shipment, so an interruption loses nothing.
+    compliance = compact_compliance(_live_compliance(store_dir, last_part))
+    _write_part(compliance, os.path.join(store_dir, "compliance"), last_part)
+    for table in ["compliance", "touched"]:
+        for part, path in _part_paths(os.path.join(store_dir, table), last_part).items():
+            if part < last_part or table == "touched":
+                os.remove(path)
+
+def _read_manifest(store_dir):
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.isfile(path):
+        return {"cleaning_version": CLEANING_VERSION, "layout": STORE_LAYOUT, "deltas": [], "no_show_uploads": [], "no_show_days": {}}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest["cleaning_version"] != CLEANING_VERSION:
+        raise ValueError(
+            f"The shipment store in '{store_dir}' was built with cleaning version {manifest['cleaning_version']} "
+            f"(current: {CLEANING_VERSION}). Remove it and ingest the reports again."
+        )
+    if manifest.get("layout", 1) != STORE_LAYOUT:
+        raise ValueError(
+            f"The shipment store in '{store_dir}' uses an older file layout. Remove it and ingest the reports again."
+        )
+    return manifest
+
+def _write_manifest(store_dir, manifest):
+    fd, tmp_path = tempfile.mkstemp(prefix=".manifest-", dir=store_dir)
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(store_dir, MANIFEST_FILE))
+
+def _write_part(df, table_dir, part, schema=None):
+    # Sorted by Shipment Key, keeping the ingestion order of each shipment's rows
+    os.makedirs(table_dir, exist_ok=True)
+    df = df.sort_values('Shipment Key', kind='stable')
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    _write_atomic(table, os.path.join(table_dir, f"part-{part:06d}.parquet"))
+
+def _part_paths(table_dir, last_part):
+    # Part files up to last_part by part number; later ones are left by an interrupted ingest
+    paths = {}
+    for path in glob.glob(os.path.join(table_dir, "part-*.parquet")):
+        part = int(os.path.basename(path)[len("part-"):-len(".parquet")])
+        if part <= last_part:
+            paths[part] = path
+    return dict(sorted(paths.items()))
+
+def _read_rows(table_dir, schema, keys, last_part):
+    # Stored rows of the shipments in keys (sorted), in the order they were ingested. Row groups
+    # whose Shipment Key statistics rule out every key are not read.
+    tables = [schema.empty_table()]
+    for path in _part_paths(table_dir, last_part).values():
+        parquet = pq.ParquetFile(path)
+        column = parquet.schema_arrow.get_field_index("Shipment Key")
+        groups = [
+            group for group in range(parquet.num_row_groups)
+            if _may_hold(parquet.metadata.row_group(group).column(column).statistics, keys)
+        ]
+        if groups:
+            table = parquet.read_row_groups(groups)
+            tables.append(table.filter(pc.is_in(table["Shipment Key"], pa.array(keys))))
+    return pa.concat_tables(tables, promote_options="permissive").to_pandas()
+
+def _may_hold(statistics, keys):
+    if statistics is None or not statistics.has_min_max:
+        return True
+    first = np.searchsorted(keys, statistics.min)
+    return first < len(keys) and keys[first] <= statistics.max
+
+def _write_atomic(table, path):
+    fd, tmp_path = tempfile.mkstemp(prefix=".staging-", suffix=".parquet", dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import weakref
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+class SpilledFrame:
+    """
+    A DataFrame written out to a temporary Parquet file by spill_frame. The file is removed
+    when this handle is garbage collected, e.g. when the session holding it ends.
+    """
+    def __init__(self, path, rows):
+        self.path = path
+        self.rows = rows
+        weakref.finalize(self, _remove_file, path)
+
+    def __len__(self):
+        return self.rows
+
+def spill_frame(df, spill_dir=None):
+    """
+    Write df to a temporary Parquet file in spill_dir (the system temp directory by default)
+    so the frame itself can be released. Returns a SpilledFrame, or df unchanged when its
+    columns cannot be stored as Parquet (e.g. numbers and text mixed in one object column).
+    """
+    if spill_dir:
+        os.makedirs(spill_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=".parquet", dir=spill_dir)
+    os.close(fd)
+    try:
+        pq.write_table(pa.Table.from_pandas(df), path)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        _remove_file(path)
+        return df
+    return SpilledFrame(path, len(df))
+
+def load_frame(frame):
+    """
+    The DataFrame behind a SpilledFrame, read back from disk; DataFrames are returned as they are.
+    """
+    if isinstance(frame, SpilledFrame):
+        return pd.read_parquet(frame.path)
+    return frame
+
+def preview_frame(frame, rows=5):
+    """
+    First rows of a DataFrame or SpilledFrame, reading only the first batch of a spilled file.
+    """
+    if not isinstance(frame, SpilledFrame):
+        return frame.head(rows)
+    batch = next(pq.ParquetFile(frame.path).iter_batches(batch_size=rows), None)
+    if batch is None:
+        return pq.read_schema(frame.path).empty_table().to_pandas()
+    return pa.Table.from_batches([batch]).to_pandas()
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
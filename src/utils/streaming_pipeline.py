@@ -0,0 +1,56 @@
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config.settings import STREAM_BLOCK_SIZE
+from src.utils.cleaning_utils import clean_trailer_activity
+from src.utils.file_handler import iter_report_batches
+
+# Columns and types written by clean_trailer_activity, fixed so every part file shares one schema
+_TIMESTAMP = pa.timestamp("ns")
+CLEANED_TRAILER_ACTIVITY_SCHEMA = pa.schema([
+    ("Checkin DateTime", _TIMESTAMP),
+    ("APPOINTMENT DATE TIME", _TIMESTAMP),
+    ("Checkout DateTime", _TIMESTAMP),
+    ("Carrier", pa.string()),
+    ("Visit Type", pa.string()),
+    ("ACTIVITY TYPE", pa.string()),
+    ("Shipment Key", pa.int64()),
+    ("Loaded DateTime", _TIMESTAMP),
+    ("Required Time", _TIMESTAMP),
+    ("Compliance", pa.dictionary(pa.int8(), pa.string())),
+])
+
+def clean_trailer_activity_to_parquet(file, output_dir, block_size=STREAM_BLOCK_SIZE):
+    """
+    Clean a Trailer Activity CSV one block at a time and write each cleaned block as a part
+    file of a Parquet dataset in output_dir. Peak memory depends on block_size, not file size.
+    The dataset can be passed to merge_compliance in place of a cleaned DataFrame.
+    Returns the number of cleaned rows written.
+    """
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+
+    rows = 0
+    part = 0
+    for batch in iter_report_batches(file, "trailer_activity", block_size):
+        cleaned = clean_trailer_activity(batch.to_pandas())
+        if cleaned.empty:
+            continue
+        _write_part(cleaned, output_dir, part)
+        rows += len(cleaned)
+        part += 1
+
+    # Keep the schema readable even when no row passed the filters
+    if part == 0:
+        pq.write_table(CLEANED_TRAILER_ACTIVITY_SCHEMA.empty_table(), _part_path(output_dir, part))
+    return rows
+
+def _write_part(df, output_dir, part):
+    table = pa.Table.from_pandas(df, schema=CLEANED_TRAILER_ACTIVITY_SCHEMA, preserve_index=False)
+    pq.write_table(table, _part_path(output_dir, part))
+
+def _part_path(output_dir, part):
+    return os.path.join(output_dir, f"part-{part:05d}.parquet")
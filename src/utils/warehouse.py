@@ -0,0 +1,99 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import duckdb
+
+from src.config.settings import WAREHOUSE_MAX_DATASETS, WAREHOUSE_PATH
+
+# One connection per warehouse file for the whole process; work runs on cursors of it
+_databases = {}
+_databases_lock = threading.Lock()
+
+@contextmanager
+def connect(path=WAREHOUSE_PATH):
+    """
+    DuckDB connection for one unit of work. With a warehouse path this is a cursor on the
+    process-wide connection to that file; cursors can be used from separate threads, and
+    views registered on one are not seen by the others. Without a path it is a throwaway
+    in-memory database.
+    """
+    con = _cursor(path) if path else duckdb.connect(":memory:")
+    try:
+        yield con
+    finally:
+        con.close()
+
+def save_datasets(dataset_key, datasets, path=WAREHOUSE_PATH, max_datasets=WAREHOUSE_MAX_DATASETS):
+    """
+    Store DataFrames (dict of name -> DataFrame) as tables in the warehouse schema of dataset_key,
+    replacing earlier ones, then drop the least recently used datasets beyond max_datasets.
+    """
+    schema = _schema(dataset_key)
+    with connect(path) as con:
+        _create_catalog(con)
+        con.begin()
+        try:
+            con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            for name, df in datasets.items():
+                con.register("incoming", df)
+                con.execute(f"CREATE OR REPLACE TABLE {schema}.{_quote_identifier(name)} AS SELECT * FROM incoming")
+                con.unregister("incoming")
+            con.execute("INSERT OR REPLACE INTO dataset_catalog VALUES (?, now())", [dataset_key])
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        _evict(con, max_datasets, keep=dataset_key)
+
+def load_datasets(dataset_key, names, path=WAREHOUSE_PATH):
+    """
+    Load the named tables of dataset_key as a dict of DataFrames, or None if any is missing.
+    """
+    with connect(path) as con:
+        tables = con.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = ?", [f"ds_{dataset_key}"]
+        ).fetchall()
+        if not set(names) <= {name for name, in tables}:
+            return None
+
+        schema = _schema(dataset_key)
+        datasets = {}
+        for name in names:
+            relation = con.sql(f"SELECT * FROM {schema}.{_quote_identifier(name)}")
+            datasets[name] = _restore_dtypes(relation.df(), dict(zip(relation.columns, relation.types)))
+        con.execute("UPDATE dataset_catalog SET used_at = now() WHERE dataset_key = ?", [dataset_key])
+        return datasets
+
+def _restore_dtypes(df, column_types):
+    # DuckDB hands UINTEGER back as uint32; No Show data holds its ISO 'Week' as UInt32
+    for col, column_type in column_types.items():
+        if column_type == duckdb.typing.UINTEGER:
+            df[col] = df[col].astype("UInt32")
+    return df
+
+def _create_catalog(con):
+    con.execute("CREATE TABLE IF NOT EXISTS dataset_catalog (dataset_key VARCHAR PRIMARY KEY, used_at TIMESTAMP)")
+
+def _evict(con, max_datasets, keep):
+    stale = con.execute(
+        "SELECT dataset_key FROM dataset_catalog WHERE dataset_key != ? ORDER BY used_at DESC OFFSET ?",
+        [keep, max(max_datasets - 1, 0)],
+    ).fetchall()
+    for dataset_key, in stale:
+        con.execute(f"DROP SCHEMA IF EXISTS {_schema(dataset_key)} CASCADE")
+        con.execute("DELETE FROM dataset_catalog WHERE dataset_key = ?", [dataset_key])
+
+def _cursor(path):
+    with _databases_lock:
+        database = _databases.get(path)
+        if database is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            database = _databases[path] = duckdb.connect(path)
+    return database.cursor()
+
+def _schema(dataset_key):
+    return _quote_identifier(f"ds_{dataset_key}")
+
+def _quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+DATETIME_FORMAT = '%m/%d/%Y %H:%M'
+
+
+def make_trailer_activity(n=500, seed=0, unique_ids=False):
+    rng = np.random.default_rng(seed)
+    appointment = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60 * 24 * 90, n), unit='min')
+    checkin = appointment + pd.to_timedelta(rng.integers(-120, 60 * 30, n), unit='min')
+    checkout = checkin + pd.to_timedelta(rng.integers(10, 600, n), unit='min')
+    if unique_ids:
+        shipment_ids = rng.choice(np.arange(1000, 1000 + 4 * n), n, replace=False)
+    else:
+        shipment_ids = rng.integers(1000, 99999, n)
+    return pd.DataFrame({
+        ' CHECKIN DATE TIME': checkin.strftime(DATETIME_FORMAT),
+        'APPOINTMENT DATE TIME': appointment.strftime(DATETIME_FORMAT),
+        'CHECKOUT DATE TIME': checkout.strftime(DATETIME_FORMAT),
+        'CARRIER': rng.choice(['ABCD', 'WXYZ', 'RLCA', 'SAIA'], n),
+        'VISIT TYPE': rng.choice(['Live Load', 'Pickup Load', 'Drop Empty'], n),
+        'ACTIVITY TYPE': rng.choice(['CLOSED', 'OPEN'], n, p=[0.8, 0.2]),
+        'SHIPMENT_ID': [f'{i:,}' for i in shipment_ids],
+        'Date/Time': checkout.strftime(DATETIME_FORMAT),
+    })
+
+
+def make_open_order(ta_df, n=1500, seed=1):
+    # Order lines for shipments seen in Trailer Activity plus some that never arrived
+    rng = np.random.default_rng(seed)
+    known_ids = ta_df['SHIPMENT_ID'].str.replace(',', '').to_numpy()
+    unknown_ids = rng.integers(100000, 200000, n).astype(str)
+    shipment_ids = np.where(rng.random(n) < 0.8, rng.choice(known_ids, n), unknown_ids)
+    appointment = pd.to_datetime(ta_df['APPOINTMENT DATE TIME'], format=DATETIME_FORMAT)
+    appt = rng.choice(appointment.to_numpy(), n)
+    appt = pd.DatetimeIndex(appt).strftime(DATETIME_FORMAT).to_numpy(dtype=object)
+    appt[rng.random(n) < 0.02] = 'TBD'
+    return pd.DataFrame({
+        'Appt Date and Time ': appt,
+        'SO #': [f' SO{i} ' for i in rng.integers(0, 3000, n)],
+        'Shipment Nbr': [f'SHP-{int(i):,}' for i in shipment_ids],
+        'Order Status': rng.choice(['Shipped', ' shipped ', 'Open', 'Cancelled'], n, p=[0.6, 0.2, 0.1, 0.1]),
+    })
+
+
+def make_open_dock(n=300, seed=2):
+    rng = np.random.default_rng(seed)
+    appt = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60 * 24 * 90, n), unit='min')
+    return pd.DataFrame({
+        'Appt Date': appt.strftime(DATETIME_FORMAT),
+        'Direction ': rng.choice(['Outbound', 'Inbound', 'OUTBOUND'], n),
+        'Status': rng.choice(['Completed', 'NoShow', 'Cancelled'], n),
+        'Carrier': rng.choice(['ABCD', 'WXYZ'], n),
+    })
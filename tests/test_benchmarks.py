@@ -0,0 +1,28 @@
+import json
+
+import pandas as pd
+
+from benchmarks.run import compare_results, main
+from benchmarks.synthetic_data import write_reports
+from src.utils.file_handler import read_report
+
+
+def test_synthetic_reports_have_the_columns_the_cleaners_read(tmp_path):
+    paths = write_reports(str(tmp_path), 1200, chunk_rows=500)
+    for name, path in paths.items():
+        assert len(pd.read_csv(path)) == 1200
+        assert len(read_report(path, name)) == 1200
+
+
+def test_run_writes_results_and_flags_regressions(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    args = ['2000', '--data-dir', str(tmp_path / 'data'), '-o', str(output), '--repeat', '1']
+    assert main(args) == 0
+
+    results = json.loads(output.read_text())['results']
+    assert results['merge_compliance']['rows'] > 0
+    assert {'summarize_rollup Week', 'summarize_compliance Year', 'read trailer_activity'} <= set(results)
+
+    faster = {name: {**result, 'seconds': result['seconds'] / 10} for name, result in results.items()}
+    regressions = compare_results(results, faster, tolerance=0.2)
+    assert len(regressions) == sum(result['seconds'] > 0 for result in results.values())
@@ -0,0 +1,49 @@
+import os
+import warnings
+
+import pandas as pd
+
+from src.utils.cache_utils import dataset_cache_key, evict_cache, load_cleaned_datasets, save_cleaned_datasets
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+NAMES = ['no_show_data', 'dwell_and_ontime_compliance']
+HASHES = {'open_dock': 'a', 'open_order': 'b', 'trailer_activity': 'c'}
+
+
+def test_cache_key_depends_on_files_and_version():
+    key = dataset_cache_key(HASHES)
+    assert key == dataset_cache_key(dict(HASHES))
+    assert key != dataset_cache_key({**HASHES, 'open_dock': 'z'})
+    assert key != dataset_cache_key(HASHES, version='next')
+
+
+def test_round_trip_preserves_cleaned_frames(tmp_path):
+    ta_df = make_trailer_activity(800, seed=5)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        datasets = {
+            'no_show_data': clean_open_dock_no_shows(make_open_dock()),
+            'dwell_and_ontime_compliance': clean_and_merge_compliance(make_open_order(ta_df, seed=5), ta_df),
+        }
+    key = dataset_cache_key(HASHES)
+    assert load_cleaned_datasets(key, NAMES, cache_dir=tmp_path) is None
+
+    save_cleaned_datasets(key, datasets, cache_dir=tmp_path)
+    cached = load_cleaned_datasets(key, NAMES, cache_dir=tmp_path)
+    for name in NAMES:
+        pd.testing.assert_frame_equal(cached[name], datasets[name])
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    df = pd.DataFrame({'x': range(1000)})
+    for i, key in enumerate(['old', 'mid', 'new']):
+        save_cleaned_datasets(key, {'data': df}, cache_dir=tmp_path, max_bytes=10**9)
+        os.utime(tmp_path / key, (i, i))
+
+    # Reading 'old' makes it the most recently used entry
+    assert load_cleaned_datasets('old', ['data'], cache_dir=tmp_path) is not None
+    entry_size = sum(f.stat().st_size for f in (tmp_path / 'mid').iterdir())
+    evict_cache(tmp_path, max_bytes=2 * entry_size)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['new', 'old']
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils.cleaning_utils import (
+    clean_and_merge_compliance,
+    clean_open_dock_no_shows,
+    clean_open_order_rows,
+    combine_open_order_rows,
+)
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+def test_cleaners_leave_inputs_unchanged():
+    ta_df = make_trailer_activity(200, seed=3)
+    oo_df = make_open_order(ta_df, seed=3)
+    od_df = make_open_dock()
+    od_df.columns = [f" {col.upper()} " for col in od_df.columns]
+    inputs = [od_df, oo_df, ta_df]
+    before = [df.copy() for df in inputs]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        clean_open_dock_no_shows(od_df)
+        clean_and_merge_compliance(oo_df, ta_df)
+
+    for df, original in zip(inputs, before):
+        assert list(df.columns) == list(original.columns)
+        assert df.equals(original)
+
+
+def test_cleaning_does_not_import_streamlit():
+    code = (
+        "import sys\n"
+        "from src.utils.cleaning_utils import clean_open_dock_no_shows\n"
+        "from tests.sample_data import make_open_dock\n"
+        "clean_open_dock_no_shows(make_open_dock())\n"
+        "assert 'streamlit' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True, cwd=Path(__file__).parents[1])
+
+
+def _combine_with_lambda(oo_df):
+    # Reference: the per-group implementation replaced by combine_open_order_rows
+    oo_df = oo_df.groupby('Shipment Nbr', as_index=False).agg({
+        'Appt Date and Time': 'first',
+        'SO #': lambda x: ', '.join(sorted(set(x))),
+    })
+    return oo_df.rename(columns={'Shipment Nbr': 'Shipment ID', 'Appt Date and Time': 'Appt DateTime', 'SO #': 'SO Number'})
+
+
+def test_combined_so_numbers_match_per_group_join():
+    ta_df = make_trailer_activity(500, seed=7)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        rows = clean_open_order_rows(make_open_order(ta_df, seed=7))
+    odd = pd.DataFrame({
+        'Shipment Nbr': ['9', '10', '9', '10', '', '9'],
+        'Appt Date and Time': pd.to_datetime(['2024-01-03', '2024-01-02', '2024-01-01', '2024-01-04', '2024-01-05', '2024-01-06']),
+        'SO #': ['SO10', 'b', 'SO9', 'B', 'x', 'SO10'],
+    })
+    for oo_rows in [rows, odd, odd.iloc[:0]]:
+        pd.testing.assert_frame_equal(combine_open_order_rows(oo_rows), _combine_with_lambda(oo_rows))
@@ -0,0 +1,74 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from src import cli
+from src.cli import main, run_pipeline
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+def _write_reports(tmp_path):
+    ta_df = make_trailer_activity(800, seed=5)
+    paths = []
+    for name, df in [('open_dock', make_open_dock()), ('open_order', make_open_order(ta_df, seed=5)), ('trailer_activity', ta_df)]:
+        path = tmp_path / f"{name}.csv"
+        df.to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def test_run_pipeline_writes_datasets_and_pivots(tmp_path):
+    output_dir = tmp_path / 'out'
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        timings, report = run_pipeline(*_write_reports(tmp_path), str(output_dir), output_format='csv')
+
+    assert report is None
+    merged = pd.read_csv(output_dir / 'dwell_and_ontime_compliance.csv')
+    assert dict((name, rows) for name, _, rows in timings)['clean and merge compliance'] == len(merged)
+    for period in ['scheduled_date', 'week', 'month', 'year']:
+        for name in ['period', 'carrier', 'dwell', 'dwell_average']:
+            assert (output_dir / 'pivots' / period / f"{name}.csv").is_file()
+
+    year_pivot = pd.read_csv(output_dir / 'pivots' / 'year' / 'period.csv')
+    assert year_pivot[['Late', 'On Time']].to_numpy().sum() == len(merged)
+
+
+def test_main_prints_timing_report(tmp_path, capsys):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        assert main([*_write_reports(tmp_path), '-o', str(tmp_path / 'out'), '--engine', 'duckdb']) == 0
+
+    report = capsys.readouterr().out
+    assert 'clean and merge compliance' in report
+    assert report.strip().splitlines()[-1].startswith('total')
+    assert (tmp_path / 'out' / 'no_show_data.parquet').is_file()
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'duckdb'])
+def test_run_pipeline_reports_memory_of_its_own_frames(tmp_path, monkeypatch, engine):
+    reads = []
+    read_report = cli.read_report
+    monkeypatch.setattr(cli, 'read_report', lambda path, report_type: reads.append(report_type) or read_report(path, report_type))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        timings, report = run_pipeline(*_write_reports(tmp_path), str(tmp_path / 'out'), engine=engine, report_memory=True)
+
+    assert sorted(reads) == ['open_dock', 'open_order', 'trailer_activity']
+    report = report.set_index('Column')
+    # Measured against the pandas engine's loose dtypes with either engine
+    assert report.loc['Dwell Time', 'Dtype Before'] == 'float64'
+    assert report.loc['Carrier', 'Dtype Before'] == 'object'
+    assert report.loc['Dwell Time', 'Dtype After'] == 'float32'
+    assert report.loc['Total', 'Bytes After'] < report.loc['Total', 'Bytes Before']
+
+
+def test_main_prints_memory_report(tmp_path, capsys):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        assert main([*_write_reports(tmp_path), '-o', str(tmp_path / 'out'), '--memory-report']) == 0
+
+    report = capsys.readouterr().out
+    assert 'Bytes Before' in report
+    assert 'Dwell Time' in report and 'float32' in report
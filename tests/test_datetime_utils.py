@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from src.utils.datetime_utils import TimestampParseWarning, detect_timestamp_format, parse_datetime_column
+from src.utils.profiling import profile_stage, profiling
+
+
+def test_format_is_detected_from_most_of_the_sample():
+    values = pd.Series(['TBD', '2024-01-02 10:00', None, *['01/03/2024 11:15'] * 5])
+    assert detect_timestamp_format(values) == '%m/%d/%Y %H:%M'
+    assert detect_timestamp_format(pd.Series(['TBD', None])) is None
+
+
+def test_failures_are_warned_and_counted_in_the_profile():
+    values = pd.Series([' 01/02/2024 10:00 ', 'TBD', '', None, '13/45/2024 10:00'], index=[5, 6, 7, 8, 9], name='Appt')
+    with profiling() as profile, profile_stage('parse'):
+        with pytest.warns(TimestampParseWarning, match="2 value"):
+            parsed = parse_datetime_column(values)
+
+    expected = pd.Series(pd.to_datetime(['2024-01-02 10:00', None, None, None, None]), index=values.index, name='Appt')
+    pd.testing.assert_series_equal(parsed, expected)
+    assert profile[0]['parse_failures'] == 2
+
+
+def test_datetime_columns_are_not_parsed_again():
+    values = pd.Series(pd.to_datetime(['2024-01-02 10:00', None]))
+    assert parse_datetime_column(values) is values
+
+
+def test_fractional_seconds_are_parsed():
+    values = pd.Series(['2024-01-02 08:05:00.123', '2024-01-02 09:05:00.5', 'TBD'])
+    assert detect_timestamp_format(values) == '%Y-%m-%d %H:%M:%S.%f'
+    with pytest.warns(TimestampParseWarning, match="1 value"):
+        parsed = parse_datetime_column(values)
+    expected = pd.Series(pd.to_datetime(['2024-01-02 08:05:00.123', '2024-01-02 09:05:00.5', None]))
+    pd.testing.assert_series_equal(parsed, expected)
+
+
+def test_utc_offsets_keep_local_clock_time_with_a_warning():
+    for values in [
+        pd.Series(['2024-01-02T08:05:00+02:00', '2024-01-02T09:05:00+02:00']),
+        pd.Series(['2024-01-02T08:05:00+02:00', '2024-01-02T09:05:00-05:00']),
+    ]:
+        with pytest.warns(TimestampParseWarning, match="UTC offsets"):
+            parsed = parse_datetime_column(values, name='Checkin')
+        pd.testing.assert_series_equal(parsed, pd.Series(pd.to_datetime(['2024-01-02 08:05', '2024-01-02 09:05'])))
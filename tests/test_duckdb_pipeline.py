@@ -0,0 +1,87 @@
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.utils import duckdb_pipeline
+from src.utils.cleaning_utils import clean_and_merge_compliance, compact_compliance
+from src.utils.datetime_utils import TimestampParseWarning
+from tests.sample_data import make_open_order, make_trailer_activity
+
+
+def test_duckdb_engine_matches_pandas_engine():
+    for seed in range(3):
+        # Unique Trailer Activity IDs: the pandas dedup keeps an arbitrary row on Appt DateTime ties
+        ta_df = make_trailer_activity(2000, seed=seed, unique_ids=True)
+        oo_df = make_open_order(ta_df, 3000, seed=seed)
+        expected = clean_and_merge_compliance(oo_df.copy(), ta_df.copy(), engine="pandas")
+        result = clean_and_merge_compliance(oo_df.copy(), ta_df.copy(), engine="duckdb")
+
+        assert isinstance(result, pa.Table)
+        assert result.column_names == list(expected.columns)
+        result = compact_compliance(result.to_pandas())
+        assert len(expected) > 0
+
+        expected = expected.sort_values('Shipment ID').reset_index(drop=True)
+        result = result.sort_values('Shipment ID').reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=True)
+
+
+def test_engines_agree_on_large_input_across_threads(monkeypatch):
+    # Enough rows for DuckDB to split the scan across threads; every shipment has many order lines
+    connect = duckdb.connect
+    monkeypatch.setattr(duckdb_pipeline.duckdb, 'connect', lambda database: connect(database, config={'threads': 8}))
+    ta_df = make_trailer_activity(20_000, seed=5, unique_ids=True)
+    oo_df = make_open_order(ta_df, 400_000, seed=5)
+    assert oo_df['Shipment Nbr'].duplicated().mean() > 0.5
+    missing = np.random.default_rng(5).random(len(oo_df))
+    oo_df.loc[missing < 0.03, 'SO #'] = None
+    oo_df.loc[missing > 0.97, 'SO #'] = np.nan
+
+    expected = clean_and_merge_compliance(oo_df.copy(), ta_df.copy(), engine="pandas")
+    result = compact_compliance(clean_and_merge_compliance(oo_df.copy(), ta_df.copy(), engine="duckdb").to_pandas())
+    assert expected['SO Number'].str.contains('nan').any()
+    assert not expected['SO Number'].str.contains('None').any()
+
+    expected = expected.sort_values('Shipment ID').reset_index(drop=True)
+    result = result.sort_values('Shipment ID').reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=True)
+
+
+def test_duckdb_engine_accepts_parsed_timestamps():
+    ta_df = make_trailer_activity(500, seed=7, unique_ids=True)
+    oo_df = make_open_order(ta_df, 800, seed=7)
+    expected = clean_and_merge_compliance(oo_df.copy(), ta_df.copy(), engine="pandas")
+
+    for col in [' CHECKIN DATE TIME', 'APPOINTMENT DATE TIME', 'CHECKOUT DATE TIME', 'Date/Time']:
+        ta_df[col] = pd.to_datetime(ta_df[col])
+    result = compact_compliance(clean_and_merge_compliance(oo_df.copy(), ta_df, engine="duckdb").to_pandas())
+
+    expected = expected.sort_values('Shipment ID').reset_index(drop=True)
+    result = result.sort_values('Shipment ID').reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=True)
+
+
+def test_engines_agree_on_fractional_seconds():
+    ta_df = make_trailer_activity(500, seed=8, unique_ids=True)
+    oo_df = make_open_order(ta_df, 800, seed=8)
+    # Exports with seconds and milliseconds, e.g. '2024-01-02 08:05:00.250'
+    for col in [' CHECKIN DATE TIME', 'APPOINTMENT DATE TIME', 'CHECKOUT DATE TIME', 'Date/Time']:
+        ta_df[col] = (pd.to_datetime(ta_df[col]) + pd.Timedelta(milliseconds=250)).dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+
+    with pytest.warns(TimestampParseWarning):
+        expected = clean_and_merge_compliance(oo_df.copy(), ta_df.copy(), engine="pandas")
+    result = compact_compliance(clean_and_merge_compliance(oo_df.copy(), ta_df, engine="duckdb").to_pandas())
+    assert len(expected) > 0
+    assert (expected['Checkin DateTime'].dt.microsecond == 250_000).all()
+
+    expected = expected.sort_values('Shipment ID').reset_index(drop=True)
+    result = result.sort_values('Shipment ID').reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=True)
+
+
+def test_unknown_engine():
+    ta_df = make_trailer_activity(10)
+    with pytest.raises(ValueError, match="polars"):
+        clean_and_merge_compliance(make_open_order(ta_df, 10), ta_df, engine="polars")
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.cleaning_utils import calculate_dwell_time, compute_dwell_time
+
+
+def row_wise_dwell_time(row):
+    # Reference implementation: the original per-row apply() callback
+    loaded_datetime = row['Loaded DateTime']
+    checkin_datetime = row['Checkin DateTime']
+    appt_datetime = row['Appt DateTime']
+    compliance = row['Compliance']
+
+    if pd.notna(loaded_datetime):
+        if compliance == 'On Time':
+            dwell_time = round((loaded_datetime - appt_datetime).total_seconds() / 3600, 2)
+        elif compliance == 'Late':
+            dwell_time = round((loaded_datetime - checkin_datetime).total_seconds() / 3600, 2)
+        else:
+            dwell_time = None
+    else:
+        dwell_time = None
+
+    if dwell_time is not None and dwell_time <= 0:
+        dwell_time = 0
+
+    return dwell_time
+
+
+def make_merged(n, seed, resolution):
+    rng = np.random.default_rng(seed)
+    appt = pd.Timestamp('2024-03-01') + pd.to_timedelta(rng.integers(0, 10**7, n), unit='s')
+    checkin = appt + pd.to_timedelta(rng.integers(-3 * 10**4, 10**5, n) * resolution, unit='ns')
+    loaded = appt + pd.to_timedelta(rng.integers(-3 * 10**4, 2 * 10**5, n) * resolution, unit='ns')
+    df = pd.DataFrame({
+        'Appt DateTime': appt,
+        'Checkin DateTime': checkin,
+        'Loaded DateTime': loaded,
+        'Compliance': rng.choice(['On Time', 'Late', 'Unknown'], n),
+    })
+    df.loc[rng.random(n) < 0.1, 'Loaded DateTime'] = pd.NaT
+    df.loc[rng.random(n) < 0.05, 'Checkin DateTime'] = pd.NaT
+    return df
+
+
+def test_compute_dwell_time_matches_row_wise_on_random_inputs():
+    # Second resolution hits exact .xx5 hour boundaries, nanoseconds exercise truncation
+    for seed, resolution in [(0, 10**9), (1, 10**9), (2, 1), (3, 10**6 + 1)]:
+        df = make_merged(5000, seed, resolution)
+        expected = df.apply(row_wise_dwell_time, axis=1).astype('float64')
+        pd.testing.assert_series_equal(compute_dwell_time(df), expected, check_exact=True)
+
+
+def test_calculate_dwell_time_wrapper():
+    df = make_merged(200, 4, 10**9)
+    for _, row in df.iterrows():
+        expected = row_wise_dwell_time(row)
+        result = calculate_dwell_time(row)
+        if expected is None or pd.isna(expected):
+            assert result is None
+        else:
+            assert result == expected
+
+
+def test_empty_frame():
+    df = make_merged(0, 5, 10**9)
+    assert compute_dwell_time(df).empty
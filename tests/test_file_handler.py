@@ -0,0 +1,93 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows
+from src.utils.file_handler import read_report
+from src.utils.profiling import profiling
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+@pytest.fixture
+def report_files(tmp_path):
+    ta_df = make_trailer_activity(1000, seed=3)
+    ta_df['UNUSED'] = 'x'
+    ta_df.loc[::50, 'CARRIER'] = None
+    oo_df = make_open_order(ta_df, 1500, seed=3)
+    # Missing SO numbers read as NaN with pd.read_csv and as None with the Arrow reader
+    oo_df.loc[::7, 'SO #'] = None
+    files = {
+        'open_dock': make_open_dock(),
+        'open_order': oo_df,
+        'trailer_activity': ta_df,
+    }
+    paths = {}
+    for report_type, df in files.items():
+        paths[report_type] = tmp_path / f'{report_type}.csv'
+        df.to_csv(paths[report_type], index=False)
+    return paths
+
+
+def test_read_report_projects_and_parses_timestamps(report_files):
+    ta_df = read_report(str(report_files['trailer_activity']), 'trailer_activity')
+    assert 'UNUSED' not in ta_df.columns
+    assert len(ta_df.columns) == 8
+    assert pd.api.types.is_datetime64_ns_dtype(ta_df[' CHECKIN DATE TIME'])
+
+    od_df = read_report(report_files['open_dock'].read_bytes(), 'open_dock')
+    assert list(od_df.columns) == ['Appt Date', 'Direction ', 'Status']
+
+
+def test_cleaned_output_matches_pd_read_csv(report_files):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with open(report_files['open_order'], 'rb') as oo_file, open(report_files['trailer_activity'], 'rb') as ta_file:
+            result = clean_and_merge_compliance(read_report(oo_file, 'open_order'), read_report(ta_file, 'trailer_activity'))
+        expected = clean_and_merge_compliance(
+            pd.read_csv(report_files['open_order'], low_memory=False),
+            pd.read_csv(report_files['trailer_activity'], low_memory=False),
+        )
+        no_shows = clean_open_dock_no_shows(read_report(str(report_files['open_dock']), 'open_dock'))
+        expected_no_shows = clean_open_dock_no_shows(pd.read_csv(report_files['open_dock'], low_memory=False))
+
+    pd.testing.assert_frame_equal(
+        result.sort_values('Shipment ID').reset_index(drop=True),
+        expected.sort_values('Shipment ID').reset_index(drop=True),
+    )
+    pd.testing.assert_frame_equal(no_shows, expected_no_shows)
+    assert result['SO Number'].str.contains('nan').any()
+
+
+def test_read_report_handles_quoted_header_with_newline(tmp_path):
+    oo_df = make_open_order(make_trailer_activity(50, seed=4), 50, seed=4)
+    oo_df.insert(0, 'Notes\n(internal)', 'x')
+    oo_df.to_csv(tmp_path / 'open_order.csv', index=False, encoding='utf-8-sig')
+
+    result = read_report(str(tmp_path / 'open_order.csv'), 'open_order')
+    assert list(result.columns) == ['Appt Date and Time ', 'SO #', 'Shipment Nbr', 'Order Status']
+    assert len(result) == 50
+
+
+def test_read_report_keeps_fractional_seconds(tmp_path):
+    ta_df = make_trailer_activity(50, seed=4)
+    ta_df[' CHECKIN DATE TIME'] = pd.to_datetime(ta_df[' CHECKIN DATE TIME']).dt.strftime('%Y-%m-%d %H:%M:%S.250')
+    ta_df.to_csv(tmp_path / 'trailer_activity.csv', index=False)
+
+    checkin = read_report(str(tmp_path / 'trailer_activity.csv'), 'trailer_activity')[' CHECKIN DATE TIME']
+    assert checkin.notna().all()
+    assert (checkin.dt.microsecond == 250_000).all()
+
+
+def test_read_report_is_profiled(report_files):
+    with profiling() as records:
+        ta_df = read_report(str(report_files['trailer_activity']), 'trailer_activity')
+
+    stages = {record['stage']: record for record in records}
+    assert list(stages) == ['trailer_activity: parse csv', 'trailer_activity: parse timestamps', 'trailer_activity: to pandas']
+    assert all(record['rows_out'] == len(ta_df) for record in records)
+
+
+def test_unknown_report_type(report_files):
+    with pytest.raises(ValueError):
+        read_report(str(report_files['open_dock']), 'open_dock_v2')
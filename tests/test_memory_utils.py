@@ -0,0 +1,47 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from src.utils.aggregation_utils import build_rollup
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows, compact_compliance
+from src.utils.memory_utils import freeze_frame, frame_view, memory_report
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+@pytest.fixture(scope='module')
+def merged_frames():
+    # The merged dataset before and after the compact dtypes, with the No Show data
+    ta_df = make_trailer_activity(3000, seed=11)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        loose = clean_and_merge_compliance(make_open_order(ta_df, 4000, seed=11), ta_df, compact=False)
+        no_shows = clean_open_dock_no_shows(make_open_dock(2000, seed=11))
+    return compact_compliance(loose), loose, no_shows
+
+
+def test_memory_report_totals_compact_savings(merged_frames):
+    compact, loose, _ = merged_frames
+    report = memory_report(loose, compact)
+    total = report.set_index('Column').loc['Total']
+    assert total['Bytes Before'] == loose.memory_usage(index=False, deep=True).sum()
+    assert total['Bytes After'] < total['Bytes Before']
+    assert report.set_index('Column').loc['Compliance', 'Dtype After'] == 'category'
+
+
+def test_frozen_frames_are_read_only_views(merged_frames):
+    merged, _, no_shows = merged_frames
+    for df in [merged, no_shows]:
+        view = frame_view(freeze_frame(df))
+        pd.testing.assert_frame_equal(view, df, check_dtype=False)
+        assert view.to_csv() == df.to_csv()
+
+    view = frame_view(freeze_frame(merged))
+    assert view['Shipment ID'].dtype == 'string[pyarrow]'
+    with pytest.raises(ValueError):
+        view['Week'].to_numpy()[0] = 0
+
+    # The dashboards' rollup is the same when built from the views
+    rollup = build_rollup(frame_view(freeze_frame(merged)), frame_view(freeze_frame(no_shows)))
+    for name, frame in build_rollup(merged, no_shows).items():
+        pd.testing.assert_frame_equal(rollup[name], frame)
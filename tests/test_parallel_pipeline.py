@@ -0,0 +1,47 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows
+from src.utils import parallel_pipeline
+from src.utils.parallel_pipeline import clean_reports
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+@pytest.fixture
+def reports():
+    ta_df = make_trailer_activity(2000, seed=11, unique_ids=True)
+    return make_open_dock(), make_open_order(ta_df, seed=11), ta_df
+
+
+@pytest.mark.parametrize('max_workers', [0, 1, 2])
+def test_clean_reports_matches_serial_cleaning(reports, max_workers):
+    od_df, oo_df, ta_df = reports
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected_no_show = clean_open_dock_no_shows(od_df)
+        expected_merged = clean_and_merge_compliance(oo_df, ta_df)
+        no_show_data, merged_df = clean_reports(od_df, oo_df, ta_df, max_workers=max_workers, min_rows=0)
+
+    pd.testing.assert_frame_equal(no_show_data, expected_no_show)
+    pd.testing.assert_frame_equal(merged_df, expected_merged)
+
+
+def test_clean_reports_raises_worker_errors(reports):
+    od_df, oo_df, ta_df = reports
+    with warnings.catch_warnings(), pytest.raises(KeyError, match='Direction'):
+        warnings.simplefilter('ignore')
+        clean_reports(od_df.drop(columns=['Direction ']), oo_df, ta_df, max_workers=2, min_rows=0)
+
+
+def test_clean_reports_reuses_one_spawned_pool(reports):
+    od_df, oo_df, ta_df = reports
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        clean_reports(od_df, oo_df, ta_df, max_workers=2, min_rows=0)
+        executor = parallel_pipeline._executor
+        clean_reports(od_df, oo_df, ta_df, max_workers=2, min_rows=0)
+
+    assert parallel_pipeline._executor is executor
+    assert executor._mp_context.get_start_method() == 'spawn'
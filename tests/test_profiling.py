@@ -0,0 +1,55 @@
+import json
+import warnings
+
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows
+from src.utils.parallel_pipeline import clean_reports
+from src.utils.profiling import log_profile, profile_stage, profiling
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+def test_stages_are_recorded_in_start_order_with_rows_and_memory():
+    ta_df = make_trailer_activity(500, seed=4)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with profiling(memory=True) as profile:
+            merged_df = clean_and_merge_compliance(make_open_order(ta_df, seed=4), ta_df)
+
+    stages = {record['stage']: record for record in profile}
+    assert profile[0]['stage'] == 'clean_and_merge_compliance' and profile[0]['depth'] == 0
+    assert stages['clean_trailer_activity']['rows_in'] == len(ta_df)
+    assert stages['merge_compliance']['rows_out'] == len(merged_df)
+    assert stages['open_order: extract shipment ids']['depth'] == 2
+    assert all(record['peak_memory_bytes'] >= 0 for record in profile)
+    assert profile[0]['peak_memory_bytes'] >= max(record['peak_memory_bytes'] for record in profile[1:])
+
+
+def test_stages_outside_profiling_are_not_recorded():
+    with profile_stage('idle', 3) as stage:
+        assert stage([1, 2]) == [1, 2]
+    with profiling() as profile:
+        with profile_stage('outer', 3) as stage:
+            stage(2)
+    assert profile == [{'stage': 'outer', 'depth': 0, 'seconds': profile[0]['seconds'],
+                        'rows_in': 3, 'rows_out': 2, 'peak_memory_bytes': None}]
+
+
+def test_worker_stages_are_added_to_the_profile():
+    ta_df = make_trailer_activity(300, seed=6)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with profiling() as profile:
+            clean_reports(make_open_dock(), make_open_order(ta_df, seed=6), ta_df, max_workers=2, min_rows=0)
+    stages = [record['stage'] for record in profile]
+    for cleaner in ['clean_open_dock_no_shows', 'clean_open_order', 'clean_trailer_activity', 'merge_compliance']:
+        assert stages.count(cleaner) == 1
+
+
+def test_profile_is_logged_as_json_lines(tmp_path):
+    with profiling() as profile:
+        clean_open_dock_no_shows(make_open_dock())
+    log_profile(profile, logs_dir=str(tmp_path), cache_key='abc')
+
+    lines = [json.loads(line) for line in (tmp_path / 'pipeline_profile.log').read_text().splitlines()]
+    assert [line['stage'] for line in lines] == [record['stage'] for record in profile]
+    assert {line['run_id'] for line in lines} == {lines[0]['run_id']}
+    assert lines[0]['cache_key'] == 'abc'
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.shipment_ids import normalize_shipment_ids, shipment_ids_from_keys, shipment_keys
+
+RAW_IDS = pd.Series(['SHP-1,234', '98765', 'n/a', None, np.nan, '007', '12345678901234567890', '0', ' 42a55', 1234.0], dtype=object)
+
+
+def test_normalized_ids_match_pandas_regex():
+    expected = RAW_IDS.astype(str).str.replace(',', '').str.extract(r'(\d+)', expand=False).fillna('')
+    pd.testing.assert_series_equal(normalize_shipment_ids(RAW_IDS), expected)
+
+
+def test_keys_are_numbers_or_round_trip_through_side_table():
+    keys, side_table = shipment_keys(RAW_IDS, return_side_table=True)
+    assert keys.dtype == 'int64'
+    assert keys.tolist()[:2] == [1234, 98765] and keys.iloc[7] == 0
+    # No digits, leading zeros and 19+ digits are hashed to negative keys
+    assert (keys.iloc[[2, 3, 4, 5, 6]] < 0).all()
+    assert keys.iloc[2] == keys.iloc[3] == keys.iloc[4]
+    assert sorted(side_table) == ['', '007', '12345678901234567890']
+
+    # Raw and already normalized IDs get the same keys
+    pd.testing.assert_series_equal(shipment_keys(normalize_shipment_ids(RAW_IDS)), keys)
+    pd.testing.assert_series_equal(shipment_ids_from_keys(keys, side_table), normalize_shipment_ids(RAW_IDS))
@@ -0,0 +1,119 @@
+import json
+import os
+import warnings
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows
+from src.utils import shipment_store
+from src.utils.shipment_store import ingest_reports, load_compliance, load_no_shows
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+def _by_shipment(df):
+    return df.sort_values('Shipment ID').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('compact_after_parts', [32, 1])
+def test_daily_deltas_match_cleaning_the_full_history(tmp_path, monkeypatch, compact_after_parts):
+    monkeypatch.setattr(shipment_store, 'COMPACT_AFTER_PARTS', compact_after_parts)
+    ta_df = make_trailer_activity(3000, seed=7, unique_ids=True)
+    oo_df = make_open_order(ta_df, seed=7)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        assert load_compliance(tmp_path) is None
+        # Shipments span deltas: Open Order and Trailer Activity rows arrive on different days
+        for day in range(3):
+            oo_delta = oo_df.iloc[day * len(oo_df) // 3:(day + 1) * len(oo_df) // 3]
+            ta_delta = ta_df.iloc[day * len(ta_df) // 4:(day + 1) * len(ta_df) // 4]
+            assert ingest_reports(oo_delta, ta_delta, tmp_path, delta_id=f"day-{day}") > 0
+        ingest_reports(oo_df.iloc[:0], ta_df.iloc[3 * len(ta_df) // 4:], tmp_path, delta_id="day-3")
+
+        expected = clean_and_merge_compliance(oo_df, ta_df)
+
+    pd.testing.assert_frame_equal(_by_shipment(load_compliance(tmp_path)), _by_shipment(expected))
+    compliance_parts = len(list((tmp_path / 'compliance').glob('*.parquet')))
+    assert compliance_parts == (4 if compact_after_parts == 32 else 1)
+
+
+def test_ingest_reads_only_row_groups_that_can_hold_affected_shipments(tmp_path, monkeypatch):
+    monkeypatch.setattr(shipment_store, 'ROW_GROUP_SIZE', 100)
+    ta_df = make_trailer_activity(2000, seed=5, unique_ids=True)
+    oo_df = make_open_order(ta_df, seed=5)
+    read = []
+    original = pq.ParquetFile.read_row_groups
+    monkeypatch.setattr(pq.ParquetFile, 'read_row_groups', lambda self, groups, **kw: read.extend(groups) or original(self, groups, **kw))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        ingest_reports(oo_df, ta_df, tmp_path, delta_id="history")
+        read.clear()
+        # Shipment numbers grow over time, so a new day's shipments sit in the last row groups
+        latest = oo_df['Shipment Nbr'].str.replace(r'\D', '', regex=True).astype(int).nlargest(5).index
+        ingest_reports(oo_df.loc[latest], ta_df.iloc[:0], tmp_path, delta_id="today")
+    history_groups = sum(pq.ParquetFile(path).num_row_groups for path in tmp_path.glob('*/part-000000.parquet'))
+    assert history_groups > 20
+    assert len(read) <= 4
+
+
+def test_ingested_delta_is_skipped(tmp_path):
+    ta_df = make_trailer_activity(300, seed=2, unique_ids=True)
+    oo_df = make_open_order(ta_df, seed=2)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        assert ingest_reports(oo_df, ta_df, tmp_path, delta_id="a") > 0
+        before = load_compliance(tmp_path)
+        assert ingest_reports(oo_df, ta_df, tmp_path, delta_id="a") == 0
+    pd.testing.assert_frame_equal(load_compliance(tmp_path), before)
+
+
+def test_store_from_other_cleaning_version_is_rejected(tmp_path):
+    (tmp_path / 'manifest.json').write_text(json.dumps({"cleaning_version": "old", "deltas": []}))
+    ta_df = make_trailer_activity(50)
+    with pytest.raises(ValueError, match='cleaning version'):
+        ingest_reports(make_open_order(ta_df), ta_df, tmp_path)
+
+
+def test_no_shows_cover_every_upload_and_newer_days_win(tmp_path):
+    ta_df = make_trailer_activity(100, seed=3, unique_ids=True)
+    oo_df = make_open_order(ta_df, seed=3)
+    no_shows = clean_open_dock_no_shows(make_open_dock(600, seed=3))
+    day = no_shows['appointment datetime'].dt.normalize()
+    january, february = no_shows[day < '2024-02-01'], no_shows[day >= '2024-02-01']
+    # A later export of the last January days, where one No Show was cancelled
+    late_january = january[january['appointment datetime'] >= '2024-01-25'].iloc[1:]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        assert load_no_shows(tmp_path) is None
+        ingest_reports(oo_df, ta_df.iloc[:50], tmp_path, delta_id="jan", no_show_data=january)
+        ingest_reports(oo_df.iloc[:0], ta_df.iloc[50:], tmp_path, delta_id="feb", no_show_data=february)
+        ingest_reports(oo_df.iloc[:0], ta_df.iloc[:0], tmp_path, delta_id="late-jan", no_show_data=late_january)
+
+    stored = load_no_shows(tmp_path)
+    assert len(stored) == len(no_shows) - 1
+    expected = no_shows.drop(index=january[january['appointment datetime'] >= '2024-01-25'].index[0])
+    pd.testing.assert_frame_equal(stored, expected.reset_index(drop=True))
+
+
+def test_new_open_dock_with_known_deltas_is_stored(tmp_path):
+    ta_df = make_trailer_activity(100, seed=4, unique_ids=True)
+    oo_df = make_open_order(ta_df, seed=4)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        first = clean_open_dock_no_shows(make_open_dock(300, seed=4))
+        # A corrected export of the same days, where one No Show was cancelled
+        second = first.drop(index=first.index[len(first) // 2])
+        assert ingest_reports(oo_df, ta_df, tmp_path, delta_id="day", no_show_data=first, no_show_id="od-1") > 0
+        # Same Open Order and Trailer Activity files, corrected Open Dock export
+        assert ingest_reports(oo_df, ta_df, tmp_path, delta_id="day", no_show_data=second, no_show_id="od-2") == 0
+        compliance = load_compliance(tmp_path)
+        # The same Open Dock file again is not stored twice
+        ingest_reports(oo_df, ta_df, tmp_path, delta_id="day", no_show_data=second, no_show_id="od-2")
+
+    pd.testing.assert_frame_equal(load_no_shows(tmp_path), second.reset_index(drop=True))
+    pd.testing.assert_frame_equal(load_compliance(tmp_path), compliance)
+    assert len(os.listdir(tmp_path / 'no_shows')) == 2
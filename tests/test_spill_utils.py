@@ -0,0 +1,28 @@
+import gc
+import os
+
+import pandas as pd
+
+from src.utils.spill_utils import SpilledFrame, load_frame, preview_frame, spill_frame
+from tests.sample_data import make_trailer_activity
+
+
+def test_spilled_frame_reads_back_and_is_removed_when_dropped(tmp_path):
+    ta_df = make_trailer_activity(300, seed=2)
+    spilled = spill_frame(ta_df, str(tmp_path / 'spill'))
+    assert isinstance(spilled, SpilledFrame) and len(spilled) == len(ta_df)
+
+    pd.testing.assert_frame_equal(load_frame(spilled), ta_df)
+    pd.testing.assert_frame_equal(preview_frame(spilled), ta_df.head())
+    assert load_frame(ta_df) is ta_df
+
+    path = spilled.path
+    del spilled
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_frames_parquet_cannot_store_stay_in_memory(tmp_path):
+    mixed = pd.DataFrame({'SHIPMENT_ID': ['1,234', 5678]})
+    assert spill_frame(mixed, str(tmp_path)) is mixed
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,36 @@
+import warnings
+
+import pandas as pd
+
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_order, clean_trailer_activity, merge_compliance
+from src.utils.file_handler import iter_report_batches, read_report
+from src.utils.streaming_pipeline import clean_trailer_activity_to_parquet
+from tests.sample_data import make_open_order, make_trailer_activity
+
+
+def test_streamed_cleaning_matches_whole_file(tmp_path):
+    ta_df = make_trailer_activity(3000, seed=4, unique_ids=True)
+    # Leading blanks: the timestamp format must come from the first non-null value in the file
+    ta_df.loc[:1500, 'Date/Time'] = None
+    path = tmp_path / 'trailer_activity.csv'
+    ta_df.to_csv(path, index=False)
+    oo_df = make_open_order(ta_df, seed=4)
+
+    assert len(list(iter_report_batches(str(path), 'trailer_activity', block_size=16 * 1024))) > 5
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        rows = clean_trailer_activity_to_parquet(str(path), tmp_path / 'cleaned', block_size=16 * 1024)
+        expected = clean_trailer_activity(read_report(str(path), 'trailer_activity')).reset_index(drop=True)
+        streamed = pd.read_parquet(tmp_path / 'cleaned')
+
+        assert rows == len(expected)
+        streamed['Compliance'] = streamed['Compliance'].astype(expected['Compliance'].dtype)
+        pd.testing.assert_frame_equal(streamed, expected)
+
+        merged = merge_compliance(clean_open_order(oo_df), str(tmp_path / 'cleaned'))
+        expected_merged = clean_and_merge_compliance(oo_df, read_report(str(path), 'trailer_activity'))
+    pd.testing.assert_frame_equal(
+        merged.sort_values('Shipment ID').reset_index(drop=True),
+        expected_merged.sort_values('Shipment ID').reset_index(drop=True),
+    )
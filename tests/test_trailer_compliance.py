@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.utils.cleaning_utils import clean_trailer_activity
+from tests.sample_data import make_trailer_activity
+
+
+def row_wise_compliance(ta_df):
+    # Reference implementation: the original per-row apply() callbacks
+    def required_time(row):
+        if row['Visit Type'] == 'Live Load':
+            return row['APPOINTMENT DATE TIME'] + pd.Timedelta(minutes=15)
+        return row['APPOINTMENT DATE TIME'] + pd.Timedelta(hours=24)
+
+    def compliance(row, required):
+        if row['Checkin DateTime'] <= required:
+            return 'On Time'
+        return 'Late'
+
+    required = ta_df.apply(required_time, axis=1)
+    labels = [compliance(row, req) for (_, row), req in zip(ta_df.iterrows(), required)]
+    return required, pd.Series(labels, index=ta_df.index)
+
+
+def test_vectorized_compliance_matches_row_wise():
+    cleaned = clean_trailer_activity(make_trailer_activity())
+    required, labels = row_wise_compliance(cleaned)
+
+    assert not cleaned.empty
+    pd.testing.assert_series_equal(cleaned['Required Time'], required, check_names=False)
+    assert cleaned['Compliance'].dtype == 'category'
+    assert (cleaned['Compliance'].astype(str) == labels).all()
+
+
+def test_grace_window_boundaries():
+    ta_df = pd.DataFrame({
+        'CHECKIN DATE TIME': ['01/01/2024 08:15', '01/01/2024 08:16', '01/02/2024 08:00', '01/02/2024 08:01'],
+        'APPOINTMENT DATE TIME': ['01/01/2024 08:00'] * 4,
+        'CHECKOUT DATE TIME': ['01/02/2024 10:00'] * 4,
+        'CARRIER': ['ABCD'] * 4,
+        'VISIT TYPE': ['Live Load', 'Live Load', 'Pickup Load', 'Pickup Load'],
+        'ACTIVITY TYPE': ['CLOSED'] * 4,
+        'SHIPMENT_ID': ['1', '2', '3', '4'],
+        'Date/Time': ['01/02/2024 10:00'] * 4,
+    })
+    cleaned = clean_trailer_activity(ta_df)
+    assert list(cleaned['Compliance']) == ['On Time', 'Late', 'On Time', 'Late']
@@ -0,0 +1,63 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.utils.aggregation_utils import build_rollup
+from src.utils.cleaning_utils import clean_and_merge_compliance, clean_open_dock_no_shows, compact_compliance
+from src.utils import warehouse
+from src.utils.warehouse import connect, load_datasets, save_datasets
+from tests.sample_data import make_open_dock, make_open_order, make_trailer_activity
+
+
+def test_round_trip_preserves_cleaned_frames(tmp_path):
+    path = str(tmp_path / 'warehouse.duckdb')
+    ta_df = make_trailer_activity(800, seed=5)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        no_show_data = clean_open_dock_no_shows(make_open_dock())
+        merged_df = clean_and_merge_compliance(make_open_order(ta_df, seed=5), ta_df)
+    datasets = {'no_show_data': no_show_data, 'dwell_and_ontime_compliance': merged_df, **build_rollup(merged_df, no_show_data)}
+
+    assert load_datasets('key', list(datasets), path=path) is None
+    save_datasets('key', {**datasets, 'raw_trailer_activity': ta_df}, path=path)
+    loaded = load_datasets('key', list(datasets), path=path)
+    # ENUM columns come back ordered; compact_compliance restores the merged schema
+    loaded['dwell_and_ontime_compliance'] = compact_compliance(loaded['dwell_and_ontime_compliance'])
+    for name, df in datasets.items():
+        pd.testing.assert_frame_equal(loaded[name], df.reset_index(drop=True))
+
+
+def test_least_recently_used_datasets_are_dropped(tmp_path):
+    path = str(tmp_path / 'warehouse.duckdb')
+    for key in ['old', 'mid', 'new']:
+        save_datasets(key, {'x': pd.DataFrame({'a': [1]})}, path=path, max_datasets=2)
+    assert load_datasets('old', ['x'], path=path) is None
+    assert load_datasets('mid', ['x'], path=path) is not None
+    assert load_datasets('new', ['x'], path=path) is not None
+
+
+def test_connections_can_be_used_from_several_threads(tmp_path):
+    path = str(tmp_path / 'warehouse.duckdb')
+
+    def total(n):
+        with connect(path) as con:
+            con.register('numbers', pd.DataFrame({'n': range(n)}))
+            return con.execute('SELECT sum(n) FROM numbers').fetchone()[0]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(total, range(1, 41))) == [n * (n - 1) // 2 for n in range(1, 41)]
+
+
+def test_merges_do_not_open_the_warehouse(tmp_path, monkeypatch):
+    # Joins run on private in-memory databases, so a CLI run is not blocked by the app's file lock
+    def locked(*args, **kwargs):
+        raise AssertionError("merge opened the warehouse")
+    monkeypatch.setattr(warehouse.connect.__wrapped__, '__defaults__', (str(tmp_path / 'warehouse.duckdb'),))
+    monkeypatch.setattr(warehouse, '_cursor', locked)
+    ta_df = make_trailer_activity(200, seed=6, unique_ids=True)
+    oo_df = make_open_order(ta_df, 300, seed=6)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for engine in ['pandas', 'duckdb']:
+            assert len(clean_and_merge_compliance(oo_df, ta_df, engine=engine)) > 0